@@ -55,6 +55,63 @@ class AgentDataCollector:
         
         logger.info(f"AgentDataCollector инициализирован с хранилищем типа {storage_type}")
     
+    def _append_json_record(self, prefix: str, record: Dict[str, Any]) -> None:
+        """
+        Дописывает одну запись в журнал JSONL за текущую дату.
+
+        В отличие от полной перезаписи JSON-файла, дозапись одной строки
+        стоит O(размер записи), а не O(всех накопленных данных за день).
+
+        Args:
+            prefix: Префикс имени файла ("interactions", "metrics", "ratings")
+            record: Запись для сохранения
+        """
+        date_str = datetime.datetime.now().strftime("%Y-%m-%d")
+        file_path = os.path.join(self.json_dir, f"{prefix}_{date_str}.jsonl")
+
+        with open(file_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def _load_json_records(self, prefix: str, dates: List[str]) -> List[Dict[str, Any]]:
+        """
+        Загружает записи за указанные даты из журналов JSONL.
+
+        Для обратной совместимости также читает старые файлы-массивы
+        формата {prefix}_{date}.json, если они есть.
+
+        Args:
+            prefix: Префикс имени файла ("interactions", "metrics", "ratings")
+            dates: Список дат в формате YYYY-MM-DD
+
+        Returns:
+            List[Dict[str, Any]]: Список загруженных записей
+        """
+        records = []
+
+        for date_str in dates:
+            # Читаем журнал JSONL построчно
+            jsonl_path = os.path.join(self.json_dir, f"{prefix}_{date_str}.jsonl")
+            if os.path.exists(jsonl_path):
+                try:
+                    with open(jsonl_path, "r", encoding="utf-8") as f:
+                        for line in f:
+                            line = line.strip()
+                            if line:
+                                records.append(json.loads(line))
+                except Exception as e:
+                    logger.error(f"Ошибка при чтении файла {jsonl_path}: {str(e)}")
+
+            # Читаем старый формат (полный JSON-массив), если он существует
+            json_path = os.path.join(self.json_dir, f"{prefix}_{date_str}.json")
+            if os.path.exists(json_path):
+                try:
+                    with open(json_path, "r", encoding="utf-8") as f:
+                        records.extend(json.load(f))
+                except Exception as e:
+                    logger.error(f"Ошибка при чтении файла {json_path}: {str(e)}")
+
+        return records
+
     def _init_db(self):
         """
         Инициализирует базу данных SQLite и создает необходимые таблицы, если их нет.
@@ -173,13 +230,8 @@ class AgentDataCollector:
                 conn.close()
             
             elif self.storage_type == "json":
-                # Сохраняем в JSON-файл
-                # Формируем имя файла на основе даты
-                date_str = datetime.datetime.now().strftime("%Y-%m-%d")
-                file_path = os.path.join(self.json_dir, f"interactions_{date_str}.json")
-                
-                # Данные для записи
-                interaction_data = {
+                # Дописываем запись в журнал JSONL за текущую дату
+                self._append_json_record("interactions", {
                     "user_id": user_id,
                     "session_id": session_id,
                     "agent_name": agent_name,
@@ -189,27 +241,7 @@ class AgentDataCollector:
                     "processing_time": processing_time,
                     "is_successful": is_successful,
                     "metadata": metadata
-                }
-                
-                # Проверяем, существует ли файл
-                if os.path.exists(file_path):
-                    # Если файл существует, загружаем данные и добавляем новую запись
-                    with open(file_path, "r", encoding="utf-8") as f:
-                        try:
-                            data = json.load(f)
-                        except json.JSONDecodeError:
-                            # Если файл поврежден, создаем новый массив
-                            data = []
-                else:
-                    # Если файл не существует, создаем новый массив
-                    data = []
-                
-                # Добавляем новую запись
-                data.append(interaction_data)
-                
-                # Сохраняем данные
-                with open(file_path, "w", encoding="utf-8") as f:
-                    json.dump(data, f, ensure_ascii=False, indent=2)
+                })
             
             else:
                 logger.error(f"Неподдерживаемый тип хранилища: {self.storage_type}")
@@ -265,39 +297,14 @@ class AgentDataCollector:
                 conn.close()
             
             elif self.storage_type == "json":
-                # Сохраняем в JSON-файл
-                # Формируем имя файла на основе даты
-                date_str = datetime.datetime.now().strftime("%Y-%m-%d")
-                file_path = os.path.join(self.json_dir, f"metrics_{date_str}.json")
-                
-                # Данные для записи
-                metric_data = {
+                # Дописываем запись в журнал JSONL за текущую дату
+                self._append_json_record("metrics", {
                     "agent_name": agent_name,
                     "metric_name": metric_name,
                     "metric_value": metric_value,
                     "timestamp": timestamp,
                     "metadata": metadata
-                }
-                
-                # Проверяем, существует ли файл
-                if os.path.exists(file_path):
-                    # Если файл существует, загружаем данные и добавляем новую запись
-                    with open(file_path, "r", encoding="utf-8") as f:
-                        try:
-                            data = json.load(f)
-                        except json.JSONDecodeError:
-                            # Если файл поврежден, создаем новый массив
-                            data = []
-                else:
-                    # Если файл не существует, создаем новый массив
-                    data = []
-                
-                # Добавляем новую запись
-                data.append(metric_data)
-                
-                # Сохраняем данные
-                with open(file_path, "w", encoding="utf-8") as f:
-                    json.dump(data, f, ensure_ascii=False, indent=2)
+                })
             
             else:
                 logger.error(f"Неподдерживаемый тип хранилища: {self.storage_type}")
@@ -352,40 +359,15 @@ class AgentDataCollector:
                 conn.close()
             
             elif self.storage_type == "json":
-                # Сохраняем в JSON-файл
-                # Формируем имя файла на основе даты
-                date_str = datetime.datetime.now().strftime("%Y-%m-%d")
-                file_path = os.path.join(self.json_dir, f"ratings_{date_str}.json")
-                
-                # Данные для записи
-                rating_data = {
+                # Дописываем запись в журнал JSONL за текущую дату
+                self._append_json_record("ratings", {
                     "user_id": user_id,
                     "session_id": session_id,
                     "interaction_id": interaction_id,
                     "rating": rating,
                     "feedback": feedback,
                     "timestamp": timestamp
-                }
-                
-                # Проверяем, существует ли файл
-                if os.path.exists(file_path):
-                    # Если файл существует, загружаем данные и добавляем новую запись
-                    with open(file_path, "r", encoding="utf-8") as f:
-                        try:
-                            data = json.load(f)
-                        except json.JSONDecodeError:
-                            # Если файл поврежден, создаем новый массив
-                            data = []
-                else:
-                    # Если файл не существует, создаем новый массив
-                    data = []
-                
-                # Добавляем новую запись
-                data.append(rating_data)
-                
-                # Сохраняем данные
-                with open(file_path, "w", encoding="utf-8") as f:
-                    json.dump(data, f, ensure_ascii=False, indent=2)
+                })
             
             else:
                 logger.error(f"Неподдерживаемый тип хранилища: {self.storage_type}")
@@ -485,17 +467,8 @@ class AgentDataCollector:
                     # Если даты не указаны, используем только текущую дату
                     dates = [datetime.datetime.now().strftime("%Y-%m-%d")]
                 
-                # Загружаем данные из файлов для каждой даты
-                all_interactions = []
-                for date_str in dates:
-                    file_path = os.path.join(self.json_dir, f"interactions_{date_str}.json")
-                    if os.path.exists(file_path):
-                        try:
-                            with open(file_path, "r", encoding="utf-8") as f:
-                                data = json.load(f)
-                                all_interactions.extend(data)
-                        except Exception as e:
-                            logger.error(f"Ошибка при чтении файла {file_path}: {str(e)}")
+                # Загружаем данные из журналов для каждой даты
+                all_interactions = self._load_json_records("interactions", dates)
                 
                 # Фильтруем по агенту, если указан
                 if agent_name:
@@ -606,17 +579,8 @@ class AgentDataCollector:
                     # Если даты не указаны, используем только текущую дату
                     dates = [datetime.datetime.now().strftime("%Y-%m-%d")]
                 
-                # Загружаем данные из файлов для каждой даты
-                all_metrics = []
-                for date_str in dates:
-                    file_path = os.path.join(self.json_dir, f"metrics_{date_str}.json")
-                    if os.path.exists(file_path):
-                        try:
-                            with open(file_path, "r", encoding="utf-8") as f:
-                                data = json.load(f)
-                                all_metrics.extend(data)
-                        except Exception as e:
-                            logger.error(f"Ошибка при чтении файла {file_path}: {str(e)}")
+                # Загружаем данные из журналов для каждой даты
+                all_metrics = self._load_json_records("metrics", dates)
                 
                 # Фильтруем по агенту, если указан
                 if agent_name:
@@ -720,17 +684,8 @@ class AgentDataCollector:
                     # Если даты не указаны, используем только текущую дату
                     dates = [datetime.datetime.now().strftime("%Y-%m-%d")]
                 
-                # Загружаем данные из файлов для каждой даты
-                all_ratings = []
-                for date_str in dates:
-                    file_path = os.path.join(self.json_dir, f"ratings_{date_str}.json")
-                    if os.path.exists(file_path):
-                        try:
-                            with open(file_path, "r", encoding="utf-8") as f:
-                                data = json.load(f)
-                                all_ratings.extend(data)
-                        except Exception as e:
-                            logger.error(f"Ошибка при чтении файла {file_path}: {str(e)}")
+                # Загружаем данные из журналов для каждой даты
+                all_ratings = self._load_json_records("ratings", dates)
                 
                 # Фильтруем по пользователю, если указан
                 if user_id:
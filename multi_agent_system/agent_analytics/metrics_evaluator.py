@@ -13,6 +13,14 @@ from multi_agent_system.logger import get_logger
 # Настройка логгера
 logger = get_logger(__name__)
 
+# Шаблоны компилируются один раз на модуль: обработчики оценивают каждый
+# ответ, и повторный поиск шаблона в кеше re на горячем пути лишний
+_GREETING_RE = re.compile(r"(здравствуйте|привет|добрый день|приветствую)")
+_FAREWELL_RE = re.compile(r"(до свидания|всего хорошего|всего доброго|удачи)")
+_INABILITY_RE = re.compile(r"(не могу|не знаю|затрудняюсь|не имею информации|нет данных)")
+_SENTENCE_SPLIT_RE = re.compile(r"[.!?]+")
+_PUNCTUATION_RE = re.compile(r"[^\w\s]")
+
 class MetricsEvaluator:
     """
     Класс для расчета метрик качества работы агентов.
@@ -51,17 +59,14 @@ class MetricsEvaluator:
         # Проверка на пустой ответ
         results["is_empty"] = len(response.strip()) == 0
         
-        # Проверка на формальности (приветствие, прощание)
-        results["has_greeting"] = bool(re.search(r"(здравствуйте|привет|добрый день|приветствую)", 
-                                                response.lower()))
-        results["has_farewell"] = bool(re.search(r"(до свидания|всего хорошего|всего доброго|удачи)", 
-                                               response.lower()))
-        
+        # Проверка на формальности (приветствие, прощание); ответ
+        # приводится к нижнему регистру один раз для всех трех проверок
+        response_lower = response.lower()
+        results["has_greeting"] = bool(_GREETING_RE.search(response_lower))
+        results["has_farewell"] = bool(_FAREWELL_RE.search(response_lower))
+
         # Проверка на наличие информации о неспособности ответить
-        results["has_inability_statement"] = bool(re.search(
-            r"(не могу|не знаю|затрудняюсь|не имею информации|нет данных)", 
-            response.lower()
-        ))
+        results["has_inability_statement"] = bool(_INABILITY_RE.search(response_lower))
         
         # Оценка связности ответа
         results["coherence"] = self._evaluate_coherence(response)
@@ -165,7 +170,7 @@ class MetricsEvaluator:
         # - Проверяем переходы между предложениями
         
         # Разбиваем текст на предложения
-        sentences = re.split(r'[.!?]+', text)
+        sentences = _SENTENCE_SPLIT_RE.split(text)
         sentences = [s.strip() for s in sentences if s.strip()]
         
         if not sentences:
@@ -206,8 +211,8 @@ class MetricsEvaluator:
         # - Проверяем пересечение ключевых слов между запросом и ответом
         
         # Приводим тексты к нижнему регистру и удаляем пунктуацию
-        request_clean = re.sub(r'[^\w\s]', '', request.lower())
-        response_clean = re.sub(r'[^\w\s]', '', response.lower())
+        request_clean = _PUNCTUATION_RE.sub('', request.lower())
+        response_clean = _PUNCTUATION_RE.sub('', response.lower())
         
         # Получаем множества слов
         request_words = set(request_clean.split())
@@ -249,8 +254,8 @@ class MetricsEvaluator:
         # - Используем коэффициент Жаккара на уровне слов
         
         # Приводим тексты к нижнему регистру и удаляем пунктуацию
-        text1_clean = re.sub(r'[^\w\s]', '', text1.lower())
-        text2_clean = re.sub(r'[^\w\s]', '', text2.lower())
+        text1_clean = _PUNCTUATION_RE.sub('', text1.lower())
+        text2_clean = _PUNCTUATION_RE.sub('', text2.lower())
         
         # Получаем множества слов
         words1 = set(text1_clean.split())
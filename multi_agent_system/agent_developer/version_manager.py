@@ -13,6 +13,7 @@ import uuid
 import shutil
 import re
 import difflib
+import hashlib
 from typing import Dict, List, Any, Optional, Union, Tuple
 
 from multi_agent_system.agents.base_agent import BaseAgent
@@ -56,8 +57,57 @@ class VersionManager:
         # Создаем директории, если они не существуют
         os.makedirs(self.versions_dir, exist_ok=True)
         os.makedirs(self.backups_dir, exist_ok=True)
-        
+
+        # Индекс "хеш конфигурации -> идентификатор версии" для каждого агента.
+        # Позволяет обнаруживать дубликаты версий за O(1) без повторного
+        # чтения и сравнения всех сохраненных файлов.
+        self._hash_index: Dict[str, Dict[str, str]] = {}
+
         logger.info(f"Менеджер версий инициализирован. Директория версий: {self.versions_dir}")
+
+    def _config_hash(self, agent_config: Dict[str, Any]) -> str:
+        """
+        Вычисляет стабильный хеш конфигурации агента.
+
+        Args:
+            agent_config: Конфигурация агента
+
+        Returns:
+            Хеш конфигурации в виде hex-строки
+        """
+        config_str = json.dumps(agent_config, sort_keys=True, ensure_ascii=False)
+        # blake2b заметно быстрее MD5, а 8 байт дайджеста достаточно
+        # для ключа внутрипроцессного индекса дубликатов
+        return hashlib.blake2b(config_str.encode('utf-8'), digest_size=8).hexdigest()
+
+    def _ensure_hash_index(self, agent_name: str) -> Dict[str, str]:
+        """
+        Возвращает индекс хешей для агента, строя его при первом обращении.
+
+        Args:
+            agent_name: Имя агента
+
+        Returns:
+            Словарь "хеш конфигурации -> идентификатор версии"
+        """
+        if agent_name not in self._hash_index:
+            index = {}
+            agent_dir = os.path.join(self.versions_dir, agent_name)
+
+            if os.path.exists(agent_dir):
+                for filename in os.listdir(agent_dir):
+                    if filename.endswith('.json'):
+                        file_path = os.path.join(agent_dir, filename)
+                        try:
+                            with open(file_path, 'r', encoding='utf-8') as f:
+                                data = json.load(f)
+                            index[self._config_hash(data["config"])] = data["metadata"]["version_id"]
+                        except Exception as e:
+                            logger.error(f"Ошибка при индексации версии {filename}: {str(e)}")
+
+            self._hash_index[agent_name] = index
+
+        return self._hash_index[agent_name]
     
     def save_agent_version(
         self, 
@@ -86,10 +136,22 @@ class VersionManager:
             agent_config = agent
             agent_name = agent.get("name", "unknown_agent")
         
+        # Проверяем по индексу хешей, не сохранена ли уже идентичная конфигурация
+        hash_index = self._ensure_hash_index(agent_name)
+        config_hash = self._config_hash(agent_config)
+        if config_hash in hash_index:
+            existing_version_id = hash_index[config_hash]
+            logger.info(f"Конфигурация агента {agent_name} уже сохранена как версия {existing_version_id}, дубликат не создается")
+
+            if is_production:
+                self.set_production_version(agent_name, existing_version_id)
+
+            return existing_version_id
+
         # Генерируем название версии, если не указано
         timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
         version_id = version_name or f"{agent_name}_v_{timestamp}"
-        
+
         # Создаем директорию для агента, если она не существует
         agent_dir = os.path.join(self.versions_dir, agent_name)
         os.makedirs(agent_dir, exist_ok=True)
@@ -112,8 +174,11 @@ class VersionManager:
                 "config": agent_config
             }, f, indent=2, ensure_ascii=False)
         
+        # Обновляем индекс хешей
+        hash_index[config_hash] = version_id
+
         logger.info(f"Сохранена версия агента {agent_name}: {version_id}")
-        
+
         # Если это продакшн-версия, обновляем ссылку на текущую продакшн-версию
         if is_production:
             self.set_production_version(agent_name, version_id)
@@ -342,13 +407,27 @@ class VersionManager:
         # Сравниваем системные промпты
         prompt1 = config1.get("system_prompt", "")
         prompt2 = config2.get("system_prompt", "")
-        
-        prompt_diff = list(difflib.unified_diff(
-            prompt1.splitlines(),
-            prompt2.splitlines(),
-            lineterm='',
-            n=3
-        ))
+
+        # Разбиваем промпты на строки один раз и сравниваем их на уровне строк.
+        # autojunk=False отключает эвристику "популярных" элементов SequenceMatcher,
+        # которая на повторяющихся строках промптов дает некорректные совпадения
+        # и квадратичное время работы.
+        prompt1_lines = prompt1.splitlines()
+        prompt2_lines = prompt2.splitlines()
+
+        matcher = difflib.SequenceMatcher(None, prompt1_lines, prompt2_lines, autojunk=False)
+        prompt_similarity = matcher.ratio()
+
+        if prompt_similarity == 1.0:
+            # Промпты идентичны, diff не вычисляем
+            prompt_diff = []
+        else:
+            prompt_diff = list(difflib.unified_diff(
+                prompt1_lines,
+                prompt2_lines,
+                lineterm='',
+                n=3
+            ))
         
         # Сравниваем другие поля конфигурации
         changed_fields = []
@@ -383,6 +462,7 @@ class VersionManager:
             "version1": version_id1,
             "version2": version_id2,
             "prompt_diff": prompt_diff,
+            "prompt_similarity": prompt_similarity,
             "changed_fields": changed_fields,
             "are_identical": len(prompt_diff) == 0 and len(changed_fields) == 0
         }
@@ -199,20 +199,22 @@ class BaseAgent:
         if not chat_history:
             return query
         
-        # Формируем контекст с историей чата
-        context = "История чата:\n"
+        # Формируем контекст с историей чата. Фрагменты накапливаются
+        # в списке и склеиваются одним join: конкатенация += копирует
+        # строку на каждой итерации
+        parts = ["История чата:\n"]
         for message in chat_history[-5:]:  # Берем последние 5 сообщений для ограничения контекста
             if isinstance(message, dict):
                 role = message.get("role", "unknown")
                 content = message.get("content", "")
-                context += f"{role.capitalize()}: {content}\n"
+                parts.append(f"{role.capitalize()}: {content}\n")
             else:
-                context += f"{message}\n"
-        
-        context += f"\nТекущий запрос: {query}\n"
-        context += "\nОтвечай только на текущий запрос, учитывая контекст из истории чата."
-        
-        return context
+                parts.append(f"{message}\n")
+
+        parts.append(f"\nТекущий запрос: {query}\n")
+        parts.append("\nОтвечай только на текущий запрос, учитывая контекст из истории чата.")
+
+        return "".join(parts)
     
     def get_config(self) -> Dict[str, Any]:
         """
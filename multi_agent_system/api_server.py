@@ -41,6 +41,10 @@ os.makedirs("logs", exist_ok=True)
 
 # Инициализация клиента Mistral и менеджера диалогов
 MISTRAL_API_URL = os.environ.get("MISTRAL_API_URL", "http://139.59.241.176:8080")
+
+# Искусственная задержка имитации обработки (в секундах). По умолчанию 0:
+# фоновые задачи завершаются без лишних циклов ожидания в event loop
+MOCK_PROCESSING_DELAY = float(os.environ.get("MOCK_PROCESSING_DELAY", "0"))
 mistral_client = MistralClient(base_url=MISTRAL_API_URL)
 conversation_manager = ConversationManager()
 
@@ -298,30 +302,31 @@ async def process_telegram_message(message: Dict[str, Any]):
             "error": True
         }
 
+# Соответствие ролей диалога типам сообщений LangChain; вынесено на
+# уровень модуля, чтобы преобразование истории обходилось одним
+# словарным поиском вместо цепочки сравнений на каждое сообщение
+_LANGCHAIN_ROLE_MAP = {"user": "human", "assistant": "ai"}
+
 def get_chat_history_for_langchain(user_id: str) -> List[Dict[str, str]]:
     """
     Преобразует историю диалога пользователя в формат, подходящий для LangChain.
-    
+
     Args:
         user_id: Идентификатор пользователя
-        
+
     Returns:
         List[Dict[str, str]]: История диалога в формате LangChain
     """
-    messages = []
-    
     # Получаем историю диалога пользователя
     history = conversation_manager.get_conversation_history(user_id)
-    
-    # Преобразуем историю в формат LangChain
-    if history:
-        for message in history:
-            if message["role"] == "user":
-                messages.append({"type": "human", "content": message["content"]})
-            elif message["role"] == "assistant":
-                messages.append({"type": "ai", "content": message["content"]})
-    
-    return messages
+
+    # Преобразуем историю в формат LangChain одним списковым включением;
+    # роли вне карты (например, системные) пропускаются, как и раньше
+    return [
+        {"type": _LANGCHAIN_ROLE_MAP[message["role"]], "content": message["content"]}
+        for message in history
+        if message["role"] in _LANGCHAIN_ROLE_MAP
+    ]
 
 def prepare_messages_for_agent(user_id: int, agent) -> List[Dict[str, str]]:
     """
@@ -406,9 +411,10 @@ async def process_task(task_id: str):
     task["status"] = "processing"
     
     try:
-        # Имитация асинхронной обработки
-        await asyncio.sleep(5)
-        
+        # Имитация асинхронной обработки (по умолчанию без ожидания)
+        if MOCK_PROCESSING_DELAY:
+            await asyncio.sleep(MOCK_PROCESSING_DELAY)
+
         # Обновляем статус задачи
         task["status"] = "completed"
         task["result"] = {"message": "Задача успешно выполнена"}
@@ -442,11 +448,13 @@ async def process_message_task(task_id: str):
         # Добавляем статусы к задаче для отслеживания прогресса
         task["status_messages"] = ["Начало обработки сообщения"]
         
-        # Имитация обработки
-        await asyncio.sleep(2)
+        # Имитация обработки (по умолчанию без ожидания)
+        if MOCK_PROCESSING_DELAY:
+            await asyncio.sleep(MOCK_PROCESSING_DELAY)
         task["status_messages"].append("Анализ запроса")
-        
-        await asyncio.sleep(3)
+
+        if MOCK_PROCESSING_DELAY:
+            await asyncio.sleep(MOCK_PROCESSING_DELAY)
         task["status_messages"].append("Генерация ответа")
         
         # Обрабатываем запрос с помощью LangChain маршрутизатора
@@ -8,7 +8,21 @@
 """
 
 from multi_agent_system.memory.conversation_memory import ConversationMemoryManager
+from multi_agent_system.memory.memory_manager import (
+    Message,
+    BufferMemory,
+    SummaryMemory,
+    MemoryManager,
+    create_simple_summarizer,
+    create_keyword_summarizer
+)
 
 __all__ = [
-    'ConversationMemoryManager'
+    'ConversationMemoryManager',
+    'Message',
+    'BufferMemory',
+    'SummaryMemory',
+    'MemoryManager',
+    'create_simple_summarizer',
+    'create_keyword_summarizer'
 ] 
\ No newline at end of file
@@ -10,6 +10,12 @@ import json
 import logging
 from typing import Dict, List, Any, Optional, Union, Tuple
 
+# orjson заметно быстрее стандартного json; используем его, если установлен
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from langchain.memory import ConversationBufferMemory, ConversationSummaryMemory
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage, BaseMessage
 from langchain_core.language_models import BaseLLM
@@ -20,6 +26,26 @@ logging.basicConfig(level=logging.INFO,
                     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+
+def _dump_json_file(data: Any, path: str) -> None:
+    """Сериализует данные в JSON-файл через orjson, если он доступен."""
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(data))
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def _load_json_file(path: str) -> Any:
+    """Загружает данные из JSON-файла через orjson, если он доступен."""
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
 class ConversationMemoryManager:
     """
     Менеджер для хранения и управления памятью разговоров.
@@ -32,27 +58,32 @@ class ConversationMemoryManager:
         self,
         storage_dir: str = "multi_agent_system/memory/storage",
         max_buffer_length: int = 20,
-        llm: Optional[BaseLLM] = None
+        llm: Optional[BaseLLM] = None,
+        persist: bool = True
     ):
         """
         Инициализирует менеджер памяти.
-        
+
         Args:
             storage_dir: Директория для хранения данных памяти
             max_buffer_length: Максимальная длина буфера сообщений
             llm: Языковая модель для суммаризации (если None, используется локальный Mistral)
+            persist: Сохранять ли память на диск. При False менеджер работает
+                полностью в оперативной памяти (удобно для тестов)
         """
         self.storage_dir = storage_dir
         self.max_buffer_length = max_buffer_length
-        
+        self.persist = persist
+
         # Инициализируем языковую модель для суммаризации
         self.llm = llm or ChatMistralAI(
             model="mistral-medium",
             mistral_api_url="http://localhost:8080/completion"
         )
-        
+
         # Создаем директорию для хранения данных памяти
-        os.makedirs(self.storage_dir, exist_ok=True)
+        if self.persist:
+            os.makedirs(self.storage_dir, exist_ok=True)
         
         # Словарь для хранения объектов памяти для каждого пользователя
         self.buffer_memories = {}
@@ -80,11 +111,10 @@ class ConversationMemoryManager:
             
             # Загружаем сохраненную память, если она существует
             memory_path = os.path.join(self.storage_dir, f"{user_id}_buffer.json")
-            if os.path.exists(memory_path):
+            if self.persist and os.path.exists(memory_path):
                 try:
-                    with open(memory_path, 'r', encoding='utf-8') as f:
-                        memory_data = json.load(f)
-                    
+                    memory_data = _load_json_file(memory_path)
+
                     # Восстанавливаем историю сообщений
                     for message_data in memory_data.get("messages", []):
                         role = message_data.get("role", "")
@@ -126,11 +156,10 @@ class ConversationMemoryManager:
             
             # Загружаем сохраненную память, если она существует
             memory_path = os.path.join(self.storage_dir, f"{user_id}_summary.json")
-            if os.path.exists(memory_path):
+            if self.persist and os.path.exists(memory_path):
                 try:
-                    with open(memory_path, 'r', encoding='utf-8') as f:
-                        memory_data = json.load(f)
-                    
+                    memory_data = _load_json_file(memory_path)
+
                     # Восстанавливаем историю сообщений и суммарную память
                     for message_data in memory_data.get("messages", []):
                         role = message_data.get("role", "")
@@ -283,24 +312,27 @@ class ConversationMemoryManager:
                 if not messages:
                     return ""
                 
-                # Создаем строковое представление сообщений в формате, понятном для LangChain
-                messages_str = ""
+                # Создаем строковое представление сообщений в формате, понятном
+                # для LangChain: фрагменты собираются в список и склеиваются
+                # одним join вместо квадратичной конкатенации +=
+                parts = []
                 for msg in messages:
                     if hasattr(msg, "type"):
                         if msg.type == "human":
-                            messages_str += f"Human: {msg.content}\n"
+                            parts.append(f"Human: {msg.content}\n")
                         elif msg.type == "ai":
-                            messages_str += f"AI: {msg.content}\n"
+                            parts.append(f"AI: {msg.content}\n")
                         elif msg.type == "system":
-                            messages_str += f"System: {msg.content}\n"
+                            parts.append(f"System: {msg.content}\n")
                     else:
                         # Для совместимости со старыми версиями
                         if isinstance(msg, HumanMessage):
-                            messages_str += f"Human: {msg.content}\n"
+                            parts.append(f"Human: {msg.content}\n")
                         elif isinstance(msg, AIMessage):
-                            messages_str += f"AI: {msg.content}\n"
+                            parts.append(f"AI: {msg.content}\n")
                         elif isinstance(msg, SystemMessage):
-                            messages_str += f"System: {msg.content}\n"
+                            parts.append(f"System: {msg.content}\n")
+                messages_str = "".join(parts)
                 
                 # Если нет сообщений, возвращаем пустую строку
                 if not messages_str:
@@ -336,14 +368,15 @@ class ConversationMemoryManager:
             self.summary_memories[user_id].clear()
         
         # Удаляем файлы памяти
-        buffer_path = os.path.join(self.storage_dir, f"{user_id}_buffer.json")
-        summary_path = os.path.join(self.storage_dir, f"{user_id}_summary.json")
-        
-        if os.path.exists(buffer_path):
-            os.remove(buffer_path)
-        
-        if os.path.exists(summary_path):
-            os.remove(summary_path)
+        if self.persist:
+            buffer_path = os.path.join(self.storage_dir, f"{user_id}_buffer.json")
+            summary_path = os.path.join(self.storage_dir, f"{user_id}_summary.json")
+
+            if os.path.exists(buffer_path):
+                os.remove(buffer_path)
+
+            if os.path.exists(summary_path):
+                os.remove(summary_path)
         
         logger.info(f"Очищена память для пользователя {user_id}")
     
@@ -354,6 +387,10 @@ class ConversationMemoryManager:
         Args:
             user_id: Идентификатор пользователя
         """
+        # В режиме работы в памяти ничего не пишем на диск
+        if not self.persist:
+            return
+
         # Сохраняем буферную память
         try:
             buffer_memory = self.get_buffer_memory(user_id)
@@ -370,9 +407,8 @@ class ConversationMemoryManager:
                     messages_data.append({"role": "system", "content": message.content})
             
             # Сохраняем данные в файл
-            with open(buffer_memory_path, 'w', encoding='utf-8') as f:
-                json.dump({"messages": messages_data}, f, ensure_ascii=False, indent=2)
-            
+            _dump_json_file({"messages": messages_data}, buffer_memory_path)
+
             logger.debug(f"Буферная память для пользователя {user_id} сохранена")
         except Exception as e:
             logger.error(f"Ошибка при сохранении буферной памяти для пользователя {user_id}: {str(e)}")
@@ -401,12 +437,11 @@ class ConversationMemoryManager:
                 summary_data = self.get_chat_summary(user_id)
             
             # Сохраняем данные в файл
-            with open(summary_memory_path, 'w', encoding='utf-8') as f:
-                json.dump({
-                    "messages": messages_data,
-                    "summary": summary_data
-                }, f, ensure_ascii=False, indent=2)
-            
+            _dump_json_file({
+                "messages": messages_data,
+                "summary": summary_data
+            }, summary_memory_path)
+
             logger.debug(f"Суммаризирующая память для пользователя {user_id} сохранена")
         except Exception as e:
             logger.error(f"Ошибка при сохранении суммаризирующей памяти для пользователя {user_id}: {str(e)}")
@@ -426,15 +461,18 @@ class ConversationMemoryManager:
             # Получаем суммаризирующую память
             summary_memory = self.get_summary_memory(user_id)
             
-            # Создаем строковое представление сообщений в формате, понятном для LangChain
-            messages_str = ""
+            # Создаем строковое представление сообщений в формате, понятном
+            # для LangChain: список фрагментов плюс один join вместо
+            # квадратичной конкатенации +=
+            parts = []
             for msg in messages:
                 if isinstance(msg, HumanMessage):
-                    messages_str += f"Human: {msg.content}\n"
+                    parts.append(f"Human: {msg.content}\n")
                 elif isinstance(msg, AIMessage):
-                    messages_str += f"AI: {msg.content}\n"
+                    parts.append(f"AI: {msg.content}\n")
                 elif isinstance(msg, SystemMessage):
-                    messages_str += f"System: {msg.content}\n"
+                    parts.append(f"System: {msg.content}\n")
+            messages_str = "".join(parts)
             
             # Получаем текущее суммарное представление
             current_summary = ""
@@ -485,13 +523,17 @@ class ConversationMemoryManager:
         Returns:
             Список идентификаторов пользователей
         """
+        # В режиме работы в памяти пользователи известны только по словарям
+        if not self.persist:
+            return list(self.buffer_memories.keys())
+
         users = set()
-        
+
         for filename in os.listdir(self.storage_dir):
             if filename.endswith("_buffer.json"):
                 user_id = filename.replace("_buffer.json", "")
                 users.add(user_id)
-        
+
         return list(users)
     
     def get_formatted_history(self, user_id: str, include_system_messages: bool = False) -> List[Dict[str, str]]:
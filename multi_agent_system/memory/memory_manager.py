@@ -0,0 +1,1087 @@
+"""
+Локальная подсистема памяти диалогов.
+
+Этот модуль реализует хранение истории диалогов без внешних зависимостей:
+сообщения, буферную память, суммаризирующую память и менеджер памяти,
+который объединяет их для нескольких пользователей. Используется там, где
+полная интеграция с LangChain (см. conversation_memory) не требуется.
+"""
+
+import os
+import re
+import sys
+import json
+import logging
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from itertools import islice
+from types import MappingProxyType
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from multi_agent_system.logger import get_logger
+from multi_agent_system.memory.storage import DiskStorage
+
+# Хранилище по умолчанию: обычная файловая система
+_DISK_STORAGE = DiskStorage()
+
+# Настройка логирования
+logger = get_logger(__name__)
+
+# Для сериализации используем orjson (C-расширение), если он установлен;
+# иначе прозрачно откатываемся на стандартный json
+try:
+    import orjson
+
+    def _dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode("utf-8")
+
+    def _dumps_bytes(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+    def _loads(data) -> Any:
+        return orjson.loads(data)
+except ImportError:
+    def _dumps(obj: Any) -> str:
+        return json.dumps(obj, ensure_ascii=False)
+
+    def _dumps_bytes(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+    def _loads(data) -> Any:
+        return json.loads(data)
+
+# Допустимые роли сообщений. Литералы интернированы: роль каждого
+# сообщения указывает на один из этих трех объектов, поэтому сравнения
+# ролей сводятся к сравнению указателей
+VALID_ROLES = tuple(sys.intern(role) for role in ("user", "assistant", "system"))
+_USER, _ASSISTANT, _SYSTEM = VALID_ROLES
+
+# Отображение роль -> интернированная роль; одновременно служит валидацией
+_ROLE_INTERN = {role: role for role in VALID_ROLES}
+
+# Общие пустые метаданные для сообщений без метаданных; словарь никогда
+# не мутируется, наружу выдается только неизменяемое представление
+_EMPTY_METADATA_DICT: Dict[str, Any] = {}
+_EMPTY_METADATA = MappingProxyType(_EMPTY_METADATA_DICT)
+
+
+class Message:
+    """
+    Сообщение в истории диалога.
+
+    Хранит роль отправителя, текст сообщения, время создания и
+    произвольные метаданные.
+
+    После создания сообщение не изменяется и может одновременно
+    принадлежать нескольким владельцам: буферной памяти, суммаризирующей
+    памяти и спискам, которые вернула история. На этой неизменяемости
+    держатся кеши (to_chat_dict) и разделяемые пустые метаданные.
+    """
+
+    # Длинные истории держат много сообщений в памяти: __slots__
+    # убирает per-instance __dict__ и ускоряет доступ к атрибутам
+    __slots__ = ("role", "content", "timestamp", "metadata", "_metadata", "_chat_dict")
+
+    def __init__(
+        self,
+        role: str,
+        content: str,
+        timestamp: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Инициализирует сообщение.
+
+        Args:
+            role: Роль отправителя ("user", "assistant" или "system")
+            content: Текст сообщения
+            timestamp: Время создания в формате ISO (если None, берется текущее)
+            metadata: Дополнительные метаданные сообщения
+
+        Raises:
+            ValueError: Если роль не входит в список допустимых
+        """
+        interned_role = _ROLE_INTERN.get(role)
+        if interned_role is None:
+            raise ValueError(f"Недопустимая роль сообщения: {role}")
+
+        self.role = interned_role
+        self.content = content
+        self.timestamp = timestamp or datetime.now().isoformat()
+
+        # Метаданные снаружи только читаются: отдаем MappingProxyType
+        # без защитного копирования словаря. Сообщения без метаданных
+        # разделяют один пустой словарь на всех
+        if metadata:
+            self._metadata = metadata
+            self.metadata = MappingProxyType(metadata)
+        else:
+            self._metadata = _EMPTY_METADATA_DICT
+            self.metadata = _EMPTY_METADATA
+        # Ленивый кеш словаря {"role", "content"}: сообщения неизменяемы,
+        # поэтому повторное форматирование истории сводится к копии ссылки
+        self._chat_dict: Optional[Dict[str, str]] = None
+
+    def to_chat_dict(self) -> Dict[str, str]:
+        """
+        Возвращает сообщение в виде словаря {"role": ..., "content": ...}.
+
+        Результат кешируется на объекте и переиспользуется при повторных
+        запросах форматированной истории.
+
+        Returns:
+            Словарь с ролью и текстом сообщения
+        """
+        chat_dict = self._chat_dict
+        if chat_dict is None:
+            chat_dict = {"role": self.role, "content": self.content}
+            self._chat_dict = chat_dict
+        return chat_dict
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Преобразует сообщение в словарь для сериализации.
+
+        Returns:
+            Словарь с полями сообщения
+        """
+        return {
+            "role": self.role,
+            "content": self.content,
+            "timestamp": self.timestamp,
+            # Отдаем исходный словарь: MappingProxyType не сериализуется
+            "metadata": self._metadata
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Message":
+        """
+        Восстанавливает сообщение из словаря.
+
+        Args:
+            data: Словарь с полями сообщения
+
+        Returns:
+            Объект Message
+
+        Raises:
+            ValueError: Если данные некорректны
+        """
+        if not isinstance(data, dict):
+            raise ValueError("Данные сообщения должны быть словарем")
+
+        if "role" not in data or "content" not in data:
+            raise ValueError("В данных сообщения отсутствуют обязательные поля")
+
+        return cls(
+            role=data["role"],
+            content=data["content"],
+            timestamp=data.get("timestamp"),
+            metadata=data.get("metadata")
+        )
+
+    def __repr__(self) -> str:
+        return f"Message(role={self.role!r}, content={self.content!r})"
+
+
+class BufferMemory:
+    """
+    Буферная память: хранит последние N сообщений диалога.
+    """
+
+    def __init__(self, max_messages: int = 50):
+        """
+        Инициализирует буферную память.
+
+        Args:
+            max_messages: Максимальное количество хранимых сообщений
+        """
+        self.max_messages = max_messages
+        # deque с maxlen отбрасывает старые сообщения за O(1),
+        # без копирования списка при каждом добавлении
+        self.messages: Deque[Message] = deque(maxlen=max_messages)
+        # Зеркальная очередь без системных сообщений: горячий путь
+        # форматированной истории читает ее напрямую, без фильтрации
+        self._non_system: Deque[Message] = deque(maxlen=max_messages)
+        # Монотонный счетчик всех когда-либо добавленных сообщений;
+        # позволяет потребителям буфера отслеживать новые сообщения
+        # независимо от вытеснения старых
+        self.total_added = 0
+
+    def add_message(self, message: Message) -> None:
+        """
+        Добавляет сообщение в буфер.
+
+        При превышении максимальной длины старые сообщения отбрасываются.
+
+        Args:
+            message: Сообщение для добавления
+        """
+        self.messages.append(message)
+        if message.role is not _SYSTEM:
+            self._non_system.append(message)
+        self.total_added += 1
+
+    def __len__(self) -> int:
+        """Возвращает текущее количество сообщений в буфере."""
+        return len(self.messages)
+
+    def extend(self, messages: List[Message]) -> None:
+        """
+        Добавляет пакет сообщений в буфер за один вызов.
+
+        Args:
+            messages: Итерируемая коллекция сообщений
+        """
+        batch = list(messages)
+        self.messages.extend(batch)
+        self._non_system.extend(
+            message for message in batch if message.role is not _SYSTEM
+        )
+        self.total_added += len(batch)
+
+    def get_messages(self, limit: Optional[int] = None) -> List[Message]:
+        """
+        Получает сообщения из буфера.
+
+        Args:
+            limit: Максимальное количество последних сообщений (если None, все)
+
+        Returns:
+            Список сообщений
+        """
+        return self._tail(self.messages, limit)
+
+    def get_non_system_messages(self, limit: Optional[int] = None) -> List[Message]:
+        """
+        Получает сообщения из буфера без системных.
+
+        Читает зеркальную очередь, заполняемую при добавлении, поэтому
+        сравнение ролей на каждом запросе не выполняется.
+
+        Args:
+            limit: Максимальное количество последних сообщений (если None, все)
+
+        Returns:
+            Список сообщений без системных
+        """
+        return self._tail(self._non_system, limit)
+
+    @staticmethod
+    def _tail(messages: Deque[Message], limit: Optional[int]) -> List[Message]:
+        """Возвращает последние limit сообщений очереди (или все)."""
+        if limit is None or limit >= len(messages):
+            return list(messages)
+
+        # Обход с правого конца: стоимость O(limit), а не O(n),
+        # как при islice от начала deque
+        tail = list(islice(reversed(messages), limit))
+        tail.reverse()
+        return tail
+
+    def clear(self) -> None:
+        """Очищает буфер."""
+        self.messages.clear()
+        self._non_system.clear()
+        self.total_added = 0
+
+    def dump(self, fp) -> None:
+        """
+        Записывает буфер в открытый файловый объект в формате JSONL.
+
+        Каждое сообщение сериализуется в отдельную строку, что позволяет
+        дописывать новые сообщения в конец файла без перезаписи истории.
+
+        Args:
+            fp: Файловый объект, открытый для записи
+        """
+        for message in self.messages:
+            fp.write(_dumps(message.to_dict()) + "\n")
+
+    def load_from(self, fp) -> None:
+        """
+        Загружает буфер из открытого файлового объекта с JSONL.
+
+        Файл читается построчно, поэтому потребление памяти не зависит
+        от длины истории.
+
+        Args:
+            fp: Файловый объект, открытый для чтения
+
+        Raises:
+            ValueError: Если содержимое некорректно
+        """
+        def _records():
+            for line in fp:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = _loads(line)
+                except ValueError as e:
+                    raise ValueError(f"Некорректный JSON в данных буфера: {str(e)}")
+                yield Message.from_dict(record)
+
+        # maxlen сам отбрасывает лишние старые сообщения при загрузке
+        self.messages = deque(_records(), maxlen=self.max_messages)
+        self._non_system = deque(
+            (message for message in self.messages if message.role is not _SYSTEM),
+            maxlen=self.max_messages
+        )
+        self.total_added = len(self.messages)
+
+    def save(self, path: str, storage=None) -> None:
+        """
+        Сохраняет буфер в JSONL-файл (полная перезапись).
+
+        Для дозаписи одного сообщения используйте append_to.
+
+        Args:
+            path: Путь к файлу
+            storage: Хранилище (по умолчанию файловая система)
+        """
+        with (storage or _DISK_STORAGE).open(path, 'w') as f:
+            self.dump(f)
+
+    @staticmethod
+    def append_to(path: str, message: Message, storage=None) -> None:
+        """
+        Дописывает одно сообщение в конец JSONL-файла.
+
+        Стоимость записи не зависит от длины уже сохраненной истории.
+
+        Args:
+            path: Путь к файлу
+            message: Сообщение для дозаписи
+            storage: Хранилище (по умолчанию файловая система)
+        """
+        with (storage or _DISK_STORAGE).open(path, 'a') as f:
+            f.write(_dumps(message.to_dict()) + "\n")
+
+    def load(self, path: str, storage=None) -> None:
+        """
+        Загружает буфер из JSONL-файла.
+
+        Args:
+            path: Путь к файлу
+            storage: Хранилище (по умолчанию файловая система)
+
+        Raises:
+            FileNotFoundError: Если файл не существует
+            ValueError: Если содержимое файла некорректно
+        """
+        with (storage or _DISK_STORAGE).open(path, 'r') as f:
+            self.load_from(f)
+
+
+class SummaryMemory:
+    """
+    Суммаризирующая память: хранит короткий буфер последних сообщений
+    и текстовое резюме более старой части диалога.
+    """
+
+    def __init__(
+        self,
+        summarizer: Optional[Callable[[List[Message], str], str]] = None,
+        buffer_size: int = 20,
+        summarize_threshold: int = 10,
+        shared_buffer: Optional[BufferMemory] = None
+    ):
+        """
+        Инициализирует суммаризирующую память.
+
+        Args:
+            summarizer: Функция суммаризации (messages, current_summary) -> str.
+                Если None, используется простое объединение текстов
+            buffer_size: Максимальный размер буфера сообщений
+            summarize_threshold: Количество сообщений, при превышении которого
+                старая часть буфера суммаризируется
+            shared_buffer: Внешний BufferMemory, из которого новые сообщения
+                подтягиваются лениво через sync(). Позволяет не хранить
+                и не добавлять каждое сообщение дважды
+        """
+        self.summarizer = summarizer or create_simple_summarizer()
+        self.buffer_size = buffer_size
+        self.summarize_threshold = summarize_threshold
+        # Кольцевой буфер: maxlen сам вытесняет лишнее без переаллокаций,
+        # а усечение при суммаризации — это popleft вместо копирующего среза
+        self.buffer: Deque[Message] = deque(maxlen=buffer_size)
+        self.summary = ""
+        self.shared_buffer = shared_buffer
+        # Сколько сообщений разделяемого буфера уже учтено в этой памяти
+        self._synced_count = 0
+        # Версия резюме: растет при каждой суммаризации и сбросе.
+        # По ней можно дешево проверять, не устарели ли производные данные
+        self._summary_version = 0
+        # Кеш собранного контекста: агенты часто опрашивают контекст
+        # между входящими сообщениями, и повторная сборка строки лишняя.
+        # Сбрасывается при любом изменении буфера или резюме
+        self._context_cache: Optional[str] = None
+        # Потоковый счетчик ключевых слов: пополняется по мере добавления
+        # сообщений, так что ключевые слова всей истории доступны без
+        # повторной обработки
+        self._keyword_counter: Counter = Counter()
+
+    def sync(self) -> None:
+        """
+        Подтягивает новые сообщения из разделяемого буфера.
+
+        Ничего не делает, если разделяемый буфер не задан или новых
+        сообщений нет: стоимость вызова пропорциональна числу сообщений,
+        добавленных с прошлой синхронизации.
+        """
+        if self.shared_buffer is None:
+            return
+
+        new_count = self.shared_buffer.total_added - self._synced_count
+        if new_count <= 0:
+            return
+
+        self._synced_count = self.shared_buffer.total_added
+        for message in self.shared_buffer.get_messages(new_count):
+            self.add_message(message)
+
+    def add_message(self, message: Message) -> None:
+        """
+        Добавляет сообщение в буфер и при необходимости обновляет резюме.
+
+        Суммаризация инкрементальная: суммаризатор получает только
+        дельту — сообщения, вытесняемые из буфера, — и текущее резюме.
+        Ранее суммаризированная история никогда не перечитывается,
+        поэтому стоимость одного срабатывания не зависит от общей
+        длины диалога.
+
+        Args:
+            message: Сообщение для добавления
+        """
+        self._context_cache = None
+        buffer = self.buffer
+        buffer.append(message)
+
+        self._keyword_counter.update(
+            word for word in _WORD_RE.findall(message.content.lower())
+            if word not in KEYWORD_STOPWORDS
+        )
+
+        # Обычный случай — буфер в пределах порога: выходим сразу,
+        # не заходя в ветку суммаризации
+        excess = len(buffer) - self.summarize_threshold
+        if excess <= 0:
+            return
+
+        # Буфер превысил порог: суммаризируем старую часть
+        messages_to_summarize = list(islice(buffer, excess))
+
+        try:
+            self.summary = self.summarizer(messages_to_summarize, self.summary)
+            self._summary_version += 1
+        except Exception as e:
+            logger.error(f"Ошибка при суммаризации сообщений: {str(e)}")
+
+        for _ in range(excess):
+            buffer.popleft()
+
+    def get_context(self) -> str:
+        """
+        Получает контекст диалога: резюме плюс последние сообщения.
+
+        Повторные вызовы без изменений памяти возвращают закешированную
+        строку без пересборки.
+
+        Returns:
+            Строка с контекстом диалога
+        """
+        self.sync()
+
+        if self._context_cache is not None:
+            return self._context_cache
+
+        parts = []
+
+        if self.summary:
+            parts.append(f"Резюме диалога: {self.summary}")
+
+        for message in self.buffer:
+            parts.append(f"{message.role}: {message.content}")
+
+        self._context_cache = "\n".join(parts)
+        return self._context_cache
+
+    def get_keywords(self, top_n: int = 10) -> List[str]:
+        """
+        Возвращает самые частые ключевые слова истории.
+
+        Счетчик наполняется потоково при добавлении сообщений, поэтому
+        вызов не перечитывает историю: только выборка top_n из Counter.
+
+        Args:
+            top_n: Количество возвращаемых ключевых слов
+
+        Returns:
+            Список ключевых слов по убыванию частоты
+        """
+        self.sync()
+        return [word for word, _ in self._keyword_counter.most_common(top_n)]
+
+    def clear(self) -> None:
+        """Очищает буфер и резюме."""
+        self.buffer.clear()
+        self.summary = ""
+        self._synced_count = 0
+        self._summary_version += 1
+        self._context_cache = None
+        self._keyword_counter.clear()
+
+    def save(self, path: str, storage=None) -> None:
+        """
+        Сохраняет память в JSON-файл.
+
+        Args:
+            path: Путь к файлу
+            storage: Хранилище (по умолчанию файловая система)
+        """
+        self.sync()
+
+        data = {
+            "summary": self.summary,
+            "messages": [message.to_dict() for message in self.buffer]
+        }
+
+        # Бинарная запись: сериализованный UTF-8 пишется одним куском,
+        # без промежуточного декодирования в str и обратного кодирования
+        # текстовым слоем файла
+        with (storage or _DISK_STORAGE).open(path, 'wb') as f:
+            f.write(_dumps_bytes(data))
+
+    def load(self, path: str, storage=None) -> None:
+        """
+        Загружает память из JSON-файла.
+
+        Args:
+            path: Путь к файлу
+            storage: Хранилище (по умолчанию файловая система)
+
+        Raises:
+            FileNotFoundError: Если файл не существует
+            ValueError: Если содержимое файла некорректно
+        """
+        with (storage or _DISK_STORAGE).open(path, 'rb') as f:
+            try:
+                data = _loads(f.read())
+            except ValueError as e:
+                raise ValueError(f"Некорректный JSON в файле {path}: {str(e)}")
+
+        if not isinstance(data, dict) or "messages" not in data:
+            raise ValueError(f"Некорректная структура данных в файле {path}")
+
+        self.summary = data.get("summary", "")
+        self._summary_version += 1
+        self._context_cache = None
+        self.buffer = deque(
+            (Message.from_dict(item) for item in data["messages"]),
+            maxlen=self.buffer_size
+        )
+
+        # Восстанавливаем счетчик ключевых слов по загруженному буферу
+        self._keyword_counter.clear()
+        for message in self.buffer:
+            self._keyword_counter.update(
+                word for word in _WORD_RE.findall(message.content.lower())
+                if word not in KEYWORD_STOPWORDS
+            )
+
+
+class MemoryManager:
+    """
+    Менеджер локальной памяти диалогов для нескольких пользователей.
+
+    Для каждого пользователя поддерживает буферную и суммаризирующую память
+    и сохраняет их на диск.
+    """
+
+    def __init__(
+        self,
+        storage_path: str = "multi_agent_system/memory/storage/local",
+        max_messages: int = 50,
+        summarizer: Optional[Callable[[List[Message], str], str]] = None,
+        summarize_threshold: int = 10,
+        storage=None
+    ):
+        """
+        Инициализирует менеджер памяти.
+
+        Args:
+            storage_path: Директория для хранения файлов памяти
+            max_messages: Максимальная длина буфера сообщений
+            summarizer: Функция суммаризации для суммаризирующей памяти
+            summarize_threshold: Порог суммаризации
+            storage: Хранилище файлов (по умолчанию DiskStorage; тесты
+                могут передать InMemoryStorage и не трогать диск)
+        """
+        self.storage_path = storage_path
+        self.max_messages = max_messages
+        self.summarizer = summarizer
+        self.summarize_threshold = summarize_threshold
+        self.storage = storage or _DISK_STORAGE
+
+        self.buffer_memories: Dict[str, BufferMemory] = {}
+        self.summary_memories: Dict[str, SummaryMemory] = {}
+
+        # Пользователи с несохраненными изменениями (резюме, компактация
+        # буфера): save_all обходит только их, а не всех подряд
+        self._dirty_users: set = set()
+
+        # Пул потоков для параллельного сохранения многих пользователей;
+        # создается лениво при первом save_all с несколькими пользователями
+        self._io_pool: Optional[ThreadPoolExecutor] = None
+
+        self.storage.makedirs(self.storage_path)
+
+        logger.info(f"Локальный менеджер памяти инициализирован. Директория хранения: {self.storage_path}")
+
+    def _buffer_path(self, user_id: str) -> str:
+        """Путь к JSONL-файлу буферной памяти пользователя."""
+        return os.path.join(self.storage_path, f"{user_id}_buffer.jsonl")
+
+    def _legacy_buffer_path(self, user_id: str) -> str:
+        """Путь к файлу буферной памяти в старом монолитном формате."""
+        return os.path.join(self.storage_path, f"{user_id}_buffer.json")
+
+    def _summary_path(self, user_id: str) -> str:
+        """Путь к файлу суммаризирующей памяти пользователя."""
+        return os.path.join(self.storage_path, f"{user_id}_summary.json")
+
+    def get_buffer_memory(self, user_id: str) -> BufferMemory:
+        """
+        Получает буферную память для пользователя, создавая ее при необходимости.
+
+        Args:
+            user_id: Идентификатор пользователя
+
+        Returns:
+            Объект BufferMemory для пользователя
+        """
+        # Один поиск в словаре на горячем пути вместо проверки in + чтения
+        memory = self.buffer_memories.get(user_id)
+        if memory is None:
+            memory = BufferMemory(max_messages=self.max_messages)
+
+            # Загружаем сохраненную память, если она существует
+            buffer_path = self._buffer_path(user_id)
+            legacy_path = self._legacy_buffer_path(user_id)
+            if self.storage.exists(buffer_path):
+                try:
+                    memory.load(buffer_path, self.storage)
+                    logger.info(f"Загружена буферная память для пользователя {user_id} ({len(memory.messages)} сообщений)")
+                except Exception as e:
+                    logger.error(f"Ошибка при загрузке буферной памяти для пользователя {user_id}: {str(e)}")
+            elif self.storage.exists(legacy_path):
+                # Одноразовая миграция со старого монолитного JSON на JSONL
+                try:
+                    with self.storage.open(legacy_path, 'r') as f:
+                        data = json.load(f)
+                    memory.extend(
+                        Message.from_dict(item) for item in data.get("messages", [])
+                    )
+                    memory.save(buffer_path, self.storage)
+                    self.storage.remove(legacy_path)
+                    logger.info(f"Буферная память пользователя {user_id} мигрирована в JSONL")
+                except Exception as e:
+                    logger.error(f"Ошибка при миграции буферной памяти для пользователя {user_id}: {str(e)}")
+
+            self.buffer_memories[user_id] = memory
+
+        return memory
+
+    def get_summary_memory(self, user_id: str) -> Optional[SummaryMemory]:
+        """
+        Получает суммаризирующую память для пользователя, создавая ее при необходимости.
+
+        Если суммаризатор не настроен, возвращает None: в этом случае
+        резюме никогда не потребляется, и держать второй буфер с его
+        файлом на каждого пользователя незачем.
+
+        Args:
+            user_id: Идентификатор пользователя
+
+        Returns:
+            Объект SummaryMemory для пользователя или None без суммаризатора
+        """
+        if self.summarizer is None:
+            return None
+
+        memory = self.summary_memories.get(user_id)
+        if memory is None:
+            shared_buffer = self.get_buffer_memory(user_id)
+            memory = SummaryMemory(
+                summarizer=self.summarizer,
+                buffer_size=self.max_messages,
+                summarize_threshold=self.summarize_threshold,
+                shared_buffer=shared_buffer
+            )
+
+            # Загружаем сохраненную память, если она существует
+            summary_path = self._summary_path(user_id)
+            if self.storage.exists(summary_path):
+                try:
+                    memory.load(summary_path, self.storage)
+                    # Сохраненное резюме уже учитывает историю буфера
+                    memory._synced_count = shared_buffer.total_added
+                    logger.info(f"Загружена суммаризирующая память для пользователя {user_id}")
+                except Exception as e:
+                    logger.error(f"Ошибка при загрузке суммаризирующей памяти для пользователя {user_id}: {str(e)}")
+
+            self.summary_memories[user_id] = memory
+
+        return memory
+
+    def _add_message(self, user_id: str, message: Message) -> None:
+        """
+        Добавляет сообщение в буфер пользователя и дописывает его на диск.
+
+        Суммаризирующая память не трогается: она разделяет буфер и
+        подтянет новые сообщения лениво при обращении к контексту.
+
+        Args:
+            user_id: Идентификатор пользователя
+            message: Сообщение для добавления
+        """
+        self.get_buffer_memory(user_id).add_message(message)
+
+        try:
+            # Дозапись одной строки вместо перезаписи всей истории;
+            # резюме сохраняется отложенно, при следующем save_all
+            BufferMemory.append_to(self._buffer_path(user_id), message, self.storage)
+        except Exception as e:
+            logger.error(f"Ошибка при сохранении памяти для пользователя {user_id}: {str(e)}")
+
+        self._dirty_users.add(user_id)
+
+    def _add_messages(self, user_id: str, messages: List[Message]) -> None:
+        """
+        Добавляет пакет сообщений в память пользователя одной операцией.
+
+        Args:
+            user_id: Идентификатор пользователя
+            messages: Список сообщений для добавления
+        """
+        self.get_buffer_memory(user_id).extend(messages)
+
+        try:
+            path = self._buffer_path(user_id)
+            with self.storage.open(path, 'a') as f:
+                for message in messages:
+                    f.write(_dumps(message.to_dict()) + "\n")
+        except Exception as e:
+            logger.error(f"Ошибка при сохранении памяти для пользователя {user_id}: {str(e)}")
+
+        self._dirty_users.add(user_id)
+
+    def add_user_message(self, user_id: str, content: str) -> None:
+        """
+        Добавляет сообщение пользователя в память.
+
+        Args:
+            user_id: Идентификатор пользователя
+            content: Текст сообщения
+        """
+        self._add_message(user_id, Message(role="user", content=content))
+
+    def add_user_messages(self, user_id: str, contents: List[str]) -> None:
+        """
+        Добавляет пакет сообщений пользователя в память.
+
+        Часы читаются один раз на весь пакет: все сообщения получают
+        общую метку времени, а файл истории открывается однократно.
+
+        Args:
+            user_id: Идентификатор пользователя
+            contents: Список текстов сообщений
+        """
+        timestamp = datetime.now().isoformat()
+        self._add_messages(user_id, [
+            Message(role=_USER, content=content, timestamp=timestamp)
+            for content in contents
+        ])
+
+    def add_assistant_message(
+        self,
+        user_id: str,
+        content: str,
+        agent_name: Optional[str] = None
+    ) -> None:
+        """
+        Добавляет ответ ассистента в память.
+
+        Args:
+            user_id: Идентификатор пользователя
+            content: Текст ответа
+            agent_name: Имя агента, сформировавшего ответ (опционально)
+        """
+        metadata = {"agent_name": agent_name} if agent_name else None
+        self._add_message(user_id, Message(role="assistant", content=content, metadata=metadata))
+
+    def add_system_message(self, user_id: str, content: str) -> None:
+        """
+        Добавляет системное сообщение в память.
+
+        Args:
+            user_id: Идентификатор пользователя
+            content: Текст системного сообщения
+        """
+        self._add_message(user_id, Message(role="system", content=content))
+
+    def get_chat_history(self, user_id: str, limit: Optional[int] = None) -> List[Message]:
+        """
+        Получает историю чата для пользователя.
+
+        Args:
+            user_id: Идентификатор пользователя
+            limit: Максимальное количество последних сообщений
+
+        Returns:
+            Список сообщений
+        """
+        return self.get_buffer_memory(user_id).get_messages(limit)
+
+    def get_formatted_history(
+        self,
+        user_id: str,
+        include_system_messages: bool = False,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, str]]:
+        """
+        Получает форматированную историю чата в виде списка словарей.
+
+        Args:
+            user_id: Идентификатор пользователя
+            include_system_messages: Включать ли системные сообщения
+            limit: Максимальное количество последних сообщений (если None, все)
+
+        Returns:
+            Список словарей {"role": ..., "content": ...}
+        """
+        # limit передается буферу (хвост достается через islice), словари
+        # сообщений кешируются на самих объектах, а несистемные сообщения
+        # читаются из заранее отфильтрованной очереди
+        buffer = self.get_buffer_memory(user_id)
+        if include_system_messages:
+            messages = buffer.get_messages(limit)
+        else:
+            messages = buffer.get_non_system_messages(limit)
+
+        return [message.to_chat_dict() for message in messages]
+
+    def get_context(self, user_id: str) -> str:
+        """
+        Получает контекст диалога пользователя (резюме плюс последние сообщения).
+
+        Args:
+            user_id: Идентификатор пользователя
+
+        Returns:
+            Строка с контекстом диалога
+        """
+        buffer = self.get_buffer_memory(user_id)
+
+        # Пока сообщений меньше порога, резюме все равно не появится:
+        # не создаем суммаризирующую память и не вызываем суммаризатор
+        # (с реальным адаптером модели это был бы лишний сетевой вызов)
+        below_threshold = (
+            self.summarizer is not None
+            and user_id not in self.summary_memories
+            and len(buffer) <= self.summarize_threshold
+            and not self.storage.exists(self._summary_path(user_id))
+        )
+
+        if self.summarizer is not None and not below_threshold:
+            return self.get_summary_memory(user_id).get_context()
+
+        # Без суммаризатора (или до порога) контекст — это просто
+        # последние сообщения буфера
+        return "\n".join(
+            f"{message.role}: {message.content}"
+            for message in buffer.messages
+        )
+
+    def save(self, user_id: str) -> None:
+        """
+        Сохраняет память пользователя на диск.
+
+        Args:
+            user_id: Идентификатор пользователя
+        """
+        try:
+            buffer_memory = self.buffer_memories.get(user_id)
+            if buffer_memory is not None:
+                buffer_memory.save(self._buffer_path(user_id), self.storage)
+
+            summary_memory = self.summary_memories.get(user_id)
+            if summary_memory is not None:
+                summary_memory.save(self._summary_path(user_id), self.storage)
+
+            self._dirty_users.discard(user_id)
+        except Exception as e:
+            logger.error(f"Ошибка при сохранении памяти для пользователя {user_id}: {str(e)}")
+
+    def save_all(self) -> None:
+        """Сохраняет на диск память пользователей с несохраненными изменениями.
+
+        Запись разных пользователей не пересекается по файлам, поэтому
+        сохранение выполняется параллельно в пуле потоков: во время
+        файловых операций GIL отпускается.
+        """
+        dirty_users = tuple(self._dirty_users)
+
+        if len(dirty_users) <= 1:
+            for user_id in dirty_users:
+                self.save(user_id)
+            return
+
+        if self._io_pool is None:
+            self._io_pool = ThreadPoolExecutor(
+                max_workers=8, thread_name_prefix="memory-save"
+            )
+
+        futures = [self._io_pool.submit(self.save, user_id) for user_id in dirty_users]
+        for future in futures:
+            future.result()
+
+    def clear(self, user_id: str) -> None:
+        """
+        Очищает память пользователя и удаляет файлы с диска.
+
+        Args:
+            user_id: Идентификатор пользователя
+        """
+        if user_id in self.buffer_memories:
+            self.buffer_memories[user_id].clear()
+
+        if user_id in self.summary_memories:
+            self.summary_memories[user_id].clear()
+
+        paths = (
+            self._buffer_path(user_id),
+            self._legacy_buffer_path(user_id),
+            self._summary_path(user_id),
+        )
+        for path in paths:
+            if self.storage.exists(path):
+                self.storage.remove(path)
+
+        self._dirty_users.discard(user_id)
+
+        logger.info(f"Очищена память для пользователя {user_id}")
+
+    def clear_all(self) -> None:
+        """Очищает память всех пользователей, включая файлы на диске."""
+        for user_id in self.get_all_users():
+            self.clear(user_id)
+
+        self.buffer_memories = {}
+        self.summary_memories = {}
+
+    def get_all_users(self) -> List[str]:
+        """
+        Получает список всех пользователей с сохраненной памятью.
+
+        Returns:
+            Список идентификаторов пользователей
+        """
+        users = set(self.buffer_memories.keys())
+
+        for filename in self.storage.listdir(self.storage_path):
+            if filename.endswith("_buffer.jsonl"):
+                users.add(filename[:-len("_buffer.jsonl")])
+            elif filename.endswith("_buffer.json"):
+                # Старый формат, еще не мигрированный в JSONL
+                users.add(filename[:-len("_buffer.json")])
+
+        return list(users)
+
+
+def create_simple_summarizer(max_length: int = 500) -> Callable[[List[Message], str], str]:
+    """
+    Создает простой суммаризатор, объединяющий тексты сообщений.
+
+    Args:
+        max_length: Максимальная длина резюме
+
+    Returns:
+        Функция суммаризации (messages, current_summary) -> str
+    """
+    def summarize(messages: List[Message], current_summary: str) -> str:
+        # Собираем резюме одним join вместо наращивания строки в цикле:
+        # конкатенация += на длинных историях квадратична
+        parts = [current_summary] if current_summary else []
+        parts.extend(f"{message.role}: {message.content}" for message in messages)
+
+        summary = " | ".join(parts)
+
+        # Ограничиваем длину резюме
+        if len(summary) > max_length:
+            summary = summary[-max_length:]
+
+        return summary
+
+    return summarize
+
+
+# Стоп-слова для суммаризатора по ключевым словам; frozenset дает
+# O(1)-проверку принадлежности
+KEYWORD_STOPWORDS = frozenset({
+    "и", "в", "на", "с", "по", "не", "что", "это", "как", "а", "но", "или",
+    "the", "a", "an", "and", "or", "of", "to", "in", "is", "it", "for", "on"
+})
+
+# Слова из букв длиной от трех символов; компилируется один раз на модуль
+_WORD_RE = re.compile(r"[^\W\d_]{3,}", re.UNICODE)
+
+
+def create_keyword_summarizer(top_n: int = 5) -> Callable[[List[Message], str], str]:
+    """
+    Создает суммаризатор, выделяющий наиболее частые ключевые слова.
+
+    Args:
+        top_n: Количество ключевых слов в резюме
+
+    Returns:
+        Функция суммаризации (messages, current_summary) -> str
+    """
+    # Частоты слов накапливаются между вызовами: при повторной
+    # суммаризации той же истории пересчитываются только новые сообщения
+    state = {"counter": Counter(), "processed": 0, "first_message": None}
+
+    def summarize(messages: List[Message], current_summary: str) -> str:
+        first_message = messages[0] if messages else None
+
+        # Если передана другая история, накопленное состояние сбрасываем
+        if state["processed"] > len(messages) or state["first_message"] is not first_message:
+            state["counter"].clear()
+            state["processed"] = 0
+            state["first_message"] = first_message
+
+        # Считаем частоты слов только по новым сообщениям: токенизация
+        # регулярным выражением и подсчет через Counter выполняются в C
+        word_counts = state["counter"]
+
+        for message in messages[state["processed"]:]:
+            word_counts.update(
+                word for word in _WORD_RE.findall(message.content.lower())
+                if word not in KEYWORD_STOPWORDS
+            )
+
+        state["processed"] = len(messages)
+
+        # Выбираем top_n самых частых слов
+        top_words = [word for word, _ in word_counts.most_common(top_n)]
+
+        keywords = ", ".join(top_words)
+
+        if current_summary:
+            return f"{current_summary}; {keywords}"
+
+        return keywords
+
+    return summarize
@@ -0,0 +1,125 @@
+"""
+Абстракция хранилища для подсистемы памяти.
+
+Позволяет подменять реальную файловую систему хранилищем в памяти
+процесса: продакшен-код работает через DiskStorage, а тесты могут
+использовать InMemoryStorage и не платить за дисковый ввод-вывод.
+"""
+
+import io
+import os
+from typing import Dict, List
+
+
+class DiskStorage:
+    """Хранилище на диске: тонкая обертка над файловыми операциями."""
+
+    def open(self, path: str, mode: str = "r"):
+        """Открывает файл по пути (текстовые режимы — в кодировке UTF-8)."""
+        if "b" in mode:
+            return open(path, mode)
+        return open(path, mode, encoding="utf-8")
+
+    def exists(self, path: str) -> bool:
+        """Проверяет существование файла."""
+        return os.path.exists(path)
+
+    def remove(self, path: str) -> None:
+        """Удаляет файл."""
+        os.remove(path)
+
+    def listdir(self, path: str) -> List[str]:
+        """Возвращает список имен файлов в директории."""
+        return os.listdir(path)
+
+    def makedirs(self, path: str) -> None:
+        """Создает директорию вместе с родительскими."""
+        os.makedirs(path, exist_ok=True)
+
+
+class _MemoryFile(io.StringIO):
+    """Файл в памяти, записывающий содержимое обратно в хранилище при закрытии."""
+
+    def __init__(self, storage: "InMemoryStorage", path: str, initial: str = ""):
+        super().__init__(initial)
+        self._storage = storage
+        self._path = path
+        if initial:
+            self.seek(0, io.SEEK_END)
+
+    def close(self) -> None:
+        self._storage._files[self._path] = self.getvalue()
+        super().close()
+
+
+class _BytesMemoryFile(io.BytesIO):
+    """Бинарный файл в памяти; при закрытии содержимое декодируется в UTF-8.
+
+    Хранилище держит все файлы как строки, поэтому бинарные записи
+    обязаны быть корректным UTF-8 (что верно для сериализованного JSON).
+    """
+
+    def __init__(self, storage: "InMemoryStorage", path: str, initial: bytes = b""):
+        super().__init__(initial)
+        self._storage = storage
+        self._path = path
+        if initial:
+            self.seek(0, io.SEEK_END)
+
+    def close(self) -> None:
+        self._storage._files[self._path] = self.getvalue().decode("utf-8")
+        super().close()
+
+
+class InMemoryStorage:
+    """
+    Хранилище в памяти процесса.
+
+    Файлы хранятся как строки в словаре по полному пути. Семантика
+    режимов "r"/"w"/"a" повторяет файловую: чтение отсутствующего пути
+    поднимает FileNotFoundError, запись создает или перезаписывает
+    содержимое, дозапись продолжает существующее.
+    """
+
+    def __init__(self):
+        self._files: Dict[str, str] = {}
+
+    def open(self, path: str, mode: str = "r"):
+        """Открывает файл-буфер в памяти в режиме r, w или a (и их бинарных вариантах)."""
+        binary = "b" in mode
+        if mode.startswith("r"):
+            if path not in self._files:
+                raise FileNotFoundError(f"Нет такого файла: {path}")
+            content = self._files[path]
+            if binary:
+                return io.BytesIO(content.encode("utf-8"))
+            return io.StringIO(content)
+
+        initial = self._files.get(path, "") if mode.startswith("a") else ""
+        if binary:
+            return _BytesMemoryFile(self, path, initial.encode("utf-8"))
+        return _MemoryFile(self, path, initial)
+
+    def exists(self, path: str) -> bool:
+        """Проверяет существование файла."""
+        return path in self._files
+
+    def remove(self, path: str) -> None:
+        """Удаляет файл."""
+        if path not in self._files:
+            raise FileNotFoundError(f"Нет такого файла: {path}")
+        del self._files[path]
+
+    def listdir(self, path: str) -> List[str]:
+        """Возвращает имена файлов непосредственно внутри директории."""
+        prefix = path.rstrip(os.sep) + os.sep
+        names = []
+        for key in self._files:
+            if key.startswith(prefix):
+                rest = key[len(prefix):]
+                if os.sep not in rest:
+                    names.append(rest)
+        return names
+
+    def makedirs(self, path: str) -> None:
+        """Директории в памяти не требуют создания."""
@@ -4,7 +4,9 @@
 """
 
 import logging
-from typing import Dict, List, Optional
+import sys
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
 from datetime import datetime
 
 from telegram_bot.config import MAX_HISTORY_LENGTH
@@ -12,6 +14,12 @@ from telegram_bot.config import MAX_HISTORY_LENGTH
 # Настройка логирования
 logger = logging.getLogger(__name__)
 
+# Интернированные константы ролей: каждое сообщение в каждом кортеже
+# истории ссылается на один и тот же строковый объект, а сравнения ролей
+# сводятся к сравнению указателей
+_USER = sys.intern("user")
+_ASSISTANT = sys.intern("assistant")
+
 class Conversation:
     """
     Класс для представления разговора пользователя с моделью.
@@ -26,7 +34,11 @@ class Conversation:
             user_id: ID пользователя в Telegram
         """
         self.user_id = user_id
-        self.messages = []  # история сообщений в формате [{role: "", content: ""}]
+        # История хранится кортежами (role, content) в кольцевом буфере:
+        # maxlen сам вытесняет старые сообщения без копирующих срезов,
+        # а кортежи компактнее словарей. Словари формата
+        # {role: "", content: ""} собираются только при выдаче истории
+        self.messages: Deque[Tuple[str, str]] = deque(maxlen=MAX_HISTORY_LENGTH)
         self.started_at = datetime.now()
         self.last_active = datetime.now()
         logger.info(f"Создан новый разговор для пользователя {user_id}")
@@ -34,50 +46,44 @@ class Conversation:
     def add_user_message(self, content: str) -> None:
         """
         Добавляет сообщение пользователя в историю.
-        
+
         Args:
             content: Текст сообщения пользователя
         """
-        message = {
-            "role": "user",
-            "content": content
-        }
-        self._add_message(message)
-    
+        self._add_message(_USER, content)
+
     def add_assistant_message(self, content: str) -> None:
         """
         Добавляет ответ ассистента в историю.
-        
+
         Args:
             content: Текст ответа ассистента
         """
-        message = {
-            "role": "assistant",
-            "content": content
-        }
-        self._add_message(message)
-    
-    def _add_message(self, message: Dict[str, str]) -> None:
+        self._add_message(_ASSISTANT, content)
+
+    def _add_message(self, role: str, content: str) -> None:
         """
         Добавляет сообщение в историю и обновляет время последней активности.
-        Следит за ограничением на количество сообщений в истории.
-        
+        Ограничение длины истории обеспечивает maxlen кольцевого буфера.
+
         Args:
-            message: Сообщение в формате {role: "", content: ""}
+            role: Роль отправителя ("user" или "assistant")
+            content: Текст сообщения
         """
-        self.messages.append(message)
+        self.messages.append((role, content))
         self.last_active = datetime.now()
-        
-        # Ограничиваем длину истории
-        if len(self.messages) > MAX_HISTORY_LENGTH:
-            self.messages = self.messages[-MAX_HISTORY_LENGTH:]
-            logger.info(f"История сообщений для пользователя {self.user_id} обрезана до {MAX_HISTORY_LENGTH}")
-    
+
+    def get_history(self) -> List[Dict[str, str]]:
+        """
+        Возвращает историю в формате [{role: "", content: ""}, ...].
+        """
+        return [{"role": role, "content": content} for role, content in self.messages]
+
     def reset(self) -> None:
         """
         Сбрасывает историю диалога.
         """
-        self.messages = []
+        self.messages.clear()
         logger.info(f"История диалога для пользователя {self.user_id} сброшена")
 
 class ConversationManager:
@@ -132,7 +138,7 @@ class ConversationManager:
             Список сообщений в формате [{role: "", content: ""}, ...]
         """
         conversation = self.get_conversation(user_id)
-        return conversation.messages
+        return conversation.get_history()
     
     def add_user_message(self, user_id: int, content: str) -> None:
         """
@@ -36,6 +36,23 @@ from multi_agent_system.logger import get_logger
 logger = get_logger(__name__)
 
 
+class _ProgressEntry:
+    """Состояние сообщения с прогрессом для одного пользователя.
+
+    __slots__ вместо словаря на запись: меньше памяти на активного
+    пользователя и доступ к полям без поиска по хешу в горячем цикле
+    обновления прогресса.
+    """
+
+    __slots__ = ("message_id", "chat_id", "start_time", "last_update")
+
+    def __init__(self, message_id: int, chat_id: int, start_time: float):
+        self.message_id = message_id
+        self.chat_id = chat_id
+        self.start_time = start_time
+        self.last_update = start_time
+
+
 class MistralTelegramBot:
     """
     Telegram бот с интеграцией Mistral API и LangChain маршрутизатором.
@@ -101,7 +118,15 @@ class MistralTelegramBot:
         
         # Словарь для хранения сообщений с прогрессом
         self.progress_messages = {}
-        
+
+        # Клавиатура выбора режима неизменна — строим один раз
+        self._mode_markup = InlineKeyboardMarkup([
+            [
+                InlineKeyboardButton("Mistral API", callback_data="mode_mistral"),
+                InlineKeyboardButton("LangChain Router", callback_data="mode_langchain")
+            ]
+        ])
+
         logger.info("Telegram бот с Mistral API инициализирован")
     
     async def start_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -184,18 +209,9 @@ class MistralTelegramBot:
             update: Объект обновления Telegram
             context: Контекст обработчика Telegram
         """
-        # Создаем клавиатуру с кнопками выбора режима
-        keyboard = [
-            [
-                InlineKeyboardButton("Mistral API", callback_data="mode_mistral"),
-                InlineKeyboardButton("LangChain Router", callback_data="mode_langchain")
-            ]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        
         await update.message.reply_text(
             "Выберите режим работы бота:",
-            reply_markup=reply_markup
+            reply_markup=self._mode_markup
         )
     
     async def handle_callback(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -251,12 +267,11 @@ class MistralTelegramBot:
         progress_message = await update.message.reply_text("⏳ Обрабатываю запрос...")
         
         # Сохраняем ID сообщения с прогрессом
-        self.progress_messages[user_id] = {
-            "message_id": progress_message.message_id,
-            "chat_id": update.effective_chat.id,
-            "start_time": time.time(),
-            "last_update": time.time()
-        }
+        self.progress_messages[user_id] = _ProgressEntry(
+            message_id=progress_message.message_id,
+            chat_id=update.effective_chat.id,
+            start_time=time.time()
+        )
         
         # Запускаем фоновую задачу для обновления сообщения с прогрессом
         asyncio.create_task(self.update_progress_message(context.bot, user_id))
@@ -276,15 +291,15 @@ class MistralTelegramBot:
             )
             
             # Удаляем запись о сообщении с прогрессом
-            self.progress_messages.pop(user_id, None)
-            
+            progress_entry = self.progress_messages.pop(user_id, None)
+
             # Редактируем сообщение с ответом
             await context.bot.edit_message_text(
                 chat_id=update.effective_chat.id,
                 message_id=progress_message.message_id,
                 text=response
             )
-            
+
             # Сохраняем взаимодействие в аналитику
             self.data_collector.record_interaction(
                 user_id=user_id,
@@ -292,7 +307,7 @@ class MistralTelegramBot:
                 agent_name=self.langchain_router.get_last_used_agent() if self.use_langchain_router else "mistral_api",
                 request=message_text,
                 response=response,
-                processing_time=time.time() - self.progress_messages.get(user_id, {}).get("start_time", time.time()),
+                processing_time=time.time() - (progress_entry.start_time if progress_entry else time.time()),
                 is_successful=True,
                 metadata={"source": "telegram_bot"}
             )
@@ -324,13 +339,15 @@ class MistralTelegramBot:
         progress_chars = ["⏳", "⌛"]
         progress_idx = 0
         
-        while user_id in self.progress_messages:
-            progress_info = self.progress_messages[user_id]
+        while True:
+            progress_info = self.progress_messages.get(user_id)
+            if progress_info is None:
+                break
             current_time = time.time()
-            elapsed_time = current_time - progress_info["start_time"]
-            
+            elapsed_time = current_time - progress_info.start_time
+
             # Обновляем сообщение с прогрессом каждые 2 секунды
-            if current_time - progress_info["last_update"] >= 2.0:
+            if current_time - progress_info.last_update >= 2.0:
                 try:
                     progress_char = progress_chars[progress_idx]
                     progress_idx = (progress_idx + 1) % len(progress_chars)
@@ -346,13 +363,13 @@ class MistralTelegramBot:
                     
                     # Обновляем сообщение
                     await bot.edit_message_text(
-                        chat_id=progress_info["chat_id"],
-                        message_id=progress_info["message_id"],
+                        chat_id=progress_info.chat_id,
+                        message_id=progress_info.message_id,
                         text=f"{progress_char} Обрабатываю запрос... ({elapsed_str}){routing_status}"
                     )
-                    
+
                     # Обновляем время последнего обновления
-                    self.progress_messages[user_id]["last_update"] = current_time
+                    progress_info.last_update = current_time
                 
                 except Exception as e:
                     logger.warning(f"Ошибка при обновлении сообщения с прогрессом для пользователя {user_id}: {str(e)}")
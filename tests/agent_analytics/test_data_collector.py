@@ -1,6 +1,4 @@
-import os
 import pytest
-import shutil
 import json
 from datetime import datetime
 
@@ -9,14 +7,13 @@ from multi_agent_system.agent_analytics.data_collector import AgentDataCollector
 
 
 @pytest.fixture
-def test_data_path():
-    """Фикстура для создания и очистки тестовой директории."""
-    path = "test_data"
-    # Создаем директорию, если она не существует
-    os.makedirs(path, exist_ok=True)
-    yield path
-    # Очищаем тестовую директорию после тестов
-    shutil.rmtree(path)
+def test_data_path(tmp_path):
+    """Фикстура тестовой директории на основе tmp_path.
+
+    pytest сам создает и удаляет директорию, а путь уже является
+    объектом pathlib.Path, так что ручные makedirs/rmtree не нужны.
+    """
+    return str(tmp_path / "data")
 
 
 def test_data_collector_init(test_data_path):
@@ -1,8 +1,40 @@
+from types import MappingProxyType
+
 import pytest
 
 # Импортируем модуль для тестирования
 from multi_agent_system.agent_analytics.metrics_evaluator import MetricsEvaluator
 
+# Тестовые ответы старой и новой версии агента. Кортежи создаются один раз
+# при импорте модуля, а MappingProxyType делает записи по-настоящему
+# неизменяемыми: тест, случайно пишущий в общую фикстуру, упадет сразу,
+# а не испортит данные соседним тестам.
+OLD_RESPONSES = tuple(MappingProxyType(item) for item in (
+    {
+        "request": "Как запустить сервер?",
+        "response": "Используйте команду start.",
+        "metrics": {"relevance": 0.5, "coherence": 0.6, "overall_quality": 0.55}
+    },
+    {
+        "request": "Как остановить сервер?",
+        "response": "Используйте команду stop.",
+        "metrics": {"relevance": 0.5, "coherence": 0.6, "overall_quality": 0.55}
+    }
+))
+
+NEW_RESPONSES = tuple(MappingProxyType(item) for item in (
+    {
+        "request": "Как запустить сервер?",
+        "response": "Для запуска сервера используйте команду `server start` в терминале.",
+        "metrics": {"relevance": 0.8, "coherence": 0.7, "overall_quality": 0.75}
+    },
+    {
+        "request": "Как остановить сервер?",
+        "response": "Чтобы остановить сервер, выполните команду `server stop` в терминале.",
+        "metrics": {"relevance": 0.8, "coherence": 0.7, "overall_quality": 0.75}
+    }
+))
+
 
 def test_metrics_evaluator_init():
     """Тест инициализации MetricsEvaluator."""
@@ -62,35 +94,8 @@ def test_evaluate_agent_improvement():
     """Тест оценки улучшений между версиями агента."""
     evaluator = MetricsEvaluator()
     
-    # Тестовые данные
-    old_responses = [
-        {
-            "request": "Как запустить сервер?",
-            "response": "Используйте команду start.",
-            "metrics": {"relevance": 0.5, "coherence": 0.6, "overall_quality": 0.55}
-        },
-        {
-            "request": "Как остановить сервер?",
-            "response": "Используйте команду stop.",
-            "metrics": {"relevance": 0.5, "coherence": 0.6, "overall_quality": 0.55}
-        }
-    ]
-    
-    new_responses = [
-        {
-            "request": "Как запустить сервер?",
-            "response": "Для запуска сервера используйте команду `server start` в терминале.",
-            "metrics": {"relevance": 0.8, "coherence": 0.7, "overall_quality": 0.75}
-        },
-        {
-            "request": "Как остановить сервер?",
-            "response": "Чтобы остановить сервер, выполните команду `server stop` в терминале.",
-            "metrics": {"relevance": 0.8, "coherence": 0.7, "overall_quality": 0.75}
-        }
-    ]
-    
-    # Оцениваем улучшения
-    improvement = evaluator.evaluate_agent_improvement(old_responses, new_responses)
+    # Оцениваем улучшения на модульных константах
+    improvement = evaluator.evaluate_agent_improvement(OLD_RESPONSES, NEW_RESPONSES)
     
     # Проверяем структуру результатов
     assert "improved_count" in improvement
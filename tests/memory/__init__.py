@@ -0,0 +1,8 @@
+"""
+Тесты для локальной подсистемы памяти диалогов.
+
+Модули тестов:
+- test_message.py - тесты для класса Message и его сериализации
+- test_buffer_memory.py - тесты для буферной памяти BufferMemory
+- test_memory_manager.py - тесты для менеджера памяти MemoryManager
+"""
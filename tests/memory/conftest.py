@@ -0,0 +1,54 @@
+"""
+Общие фикстуры для тестов подсистемы памяти.
+
+Модули тестов независимы и безопасны для параллельного запуска
+через pytest-xdist (`pytest -n auto`). Тесты, патчащие классы на
+уровне модуля, группируются на одном воркере через xdist_group.
+"""
+
+import uuid
+
+import pytest
+
+# Тесты, которые патчат атрибуты классов (а не экземпляров) и потому
+# должны выполняться на одном воркере xdist; сейчас таких нет
+_GROUPED_TESTS = ()
+
+
+def pytest_collection_modifyitems(items):
+    """Помечает тесты с патчами уровня класса общей группой xdist."""
+    for item in items:
+        if item.originalname in _GROUPED_TESTS:
+            item.add_marker(pytest.mark.xdist_group("memory_system"))
+
+
+@pytest.fixture(scope="session")
+def memory_storage_root(tmp_path_factory):
+    """Общая директория хранения для всей сессии тестов.
+
+    Создается один раз за сессию вместо создания и удаления отдельной
+    временной директории в каждом тесте.
+    """
+    return tmp_path_factory.mktemp("memory_storage")
+
+
+@pytest.fixture
+def storage_path(memory_storage_root):
+    """Уникальная поддиректория внутри общей сессионной директории.
+
+    Уникальный uuid-суффикс сохраняет изоляцию тестов (в том числе при
+    параллельном запуске), не платя за создание/удаление tmpdir на тест.
+    """
+    path = memory_storage_root / uuid.uuid4().hex
+    path.mkdir()
+    return str(path)
+
+
+@pytest.fixture
+def storage_file(memory_storage_root):
+    """Уникальный путь к файлу внутри общей сессионной директории.
+
+    Для тестов, которым нужен один файл, а не директория: не требует
+    даже mkdir на тест — только уникальное uuid-имя.
+    """
+    return str(memory_storage_root / f"{uuid.uuid4().hex}.json")
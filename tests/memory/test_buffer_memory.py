@@ -0,0 +1,157 @@
+"""
+Тесты для буферной памяти BufferMemory.
+"""
+
+import io
+import os
+from unittest.mock import patch
+
+import pytest
+
+from multi_agent_system.memory.memory_manager import BufferMemory, Message
+
+# Для записи тестовых JSON-файлов используем orjson, если он установлен:
+# кодирование заметно быстрее stdlib, а сам тестируемый код не затрагивается
+try:
+    import orjson
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:
+    import json
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+# Сообщения создаются один раз при импорте модуля: тесты только читают их,
+# поэтому пересоздавать объекты в каждом цикле не нужно
+MESSAGES = tuple(Message(role="user", content=f"Сообщение {i}") for i in range(20))
+
+
+def test_add_messages():
+    """Тест добавления сообщений в буфер."""
+    memory = BufferMemory(max_messages=50)
+
+    for message in MESSAGES[:10]:
+        memory.add_message(message)
+
+    assert len(memory) == 10
+    assert memory.messages[0].content == "Сообщение 0"
+    assert memory.messages[-1].content == "Сообщение 9"
+
+
+def test_max_messages_limit():
+    """Тест ограничения длины буфера."""
+    memory = BufferMemory(max_messages=5)
+
+    for message in MESSAGES:
+        memory.add_message(message)
+
+    assert len(memory) == 5
+    # В буфере остаются только последние сообщения
+    assert memory.messages[0].content == "Сообщение 15"
+    assert memory.messages[-1].content == "Сообщение 19"
+
+
+def test_extend():
+    """Тест пакетного добавления сообщений."""
+    memory = BufferMemory(max_messages=5)
+
+    memory.extend(MESSAGES[:10])
+
+    assert len(memory) == 5
+    assert memory.messages[0].content == "Сообщение 5"
+    assert memory.messages[-1].content == "Сообщение 9"
+
+
+def test_get_messages_with_limit():
+    """Тест получения последних сообщений с лимитом."""
+    memory = BufferMemory(max_messages=50)
+
+    memory.extend(MESSAGES[:10])
+
+    last_three = memory.get_messages(limit=3)
+
+    assert len(last_three) == 3
+    assert last_three[0].content == "Сообщение 7"
+
+
+def test_save_and_load():
+    """Тест сохранения и загрузки буфера через файловый объект."""
+    memory = BufferMemory(max_messages=50)
+    memory.extend(MESSAGES[:5])
+
+    # Round-trip через буфер в памяти: диск в этом тесте не нужен
+    stream = io.StringIO()
+    memory.dump(stream)
+    stream.seek(0)
+
+    restored = BufferMemory(max_messages=50)
+    restored.load_from(stream)
+
+    assert len(restored) == 5
+    assert restored.messages[0].content == "Сообщение 0"
+    assert restored.messages[-1].content == "Сообщение 4"
+
+
+def test_buffer_memory_save_permission_error(storage_path):
+    """Тест обработки ошибки прав доступа при сохранении.
+
+    Ошибка имитируется подменой open: это не требует реальных
+    манипуляций с правами файлов и работает одинаково на всех ОС.
+    Поэтому тесту не нужны skipif-маркеры для root (chmod не
+    ограничивает root в CI-контейнерах) и для Windows (другая
+    семантика прав) — условий, при которых chmod-версия давала бы
+    ложный результат или пропуск.
+    """
+    memory = BufferMemory(max_messages=50)
+    memory.add_message(Message(role="user", content="Сообщение"))
+
+    with patch("builtins.open", side_effect=PermissionError("нет доступа")):
+        with pytest.raises(PermissionError, match="нет доступа"):
+            memory.save(os.path.join(storage_path, "buffer.json"))
+
+
+def _write_bytes(payload: bytes):
+    """Возвращает writer, записывающий в файл готовые байты."""
+    def writer(path):
+        with open(path, "wb") as f:
+            f.write(payload)
+    return writer
+
+
+# match закрепляет не только тип, но и конкретную ветку ошибки:
+# без него тест прошел бы и на ValueError из другого места загрузчика
+@pytest.mark.parametrize("writer,exc,match", [
+    pytest.param(None, FileNotFoundError, None, id="missing_file"),
+    pytest.param(_write_bytes("{не json".encode("utf-8")), ValueError,
+                 "Некорректный JSON", id="invalid_json"),
+    pytest.param(_write_bytes(_dumps([1, 2, 3])), ValueError,
+                 "должны быть словарем", id="wrong_structure"),
+    pytest.param(
+        _write_bytes(_dumps({"messages": [{"role": "robot", "content": "x"}]})),
+        ValueError, "обязательные поля", id="wrong_record_shape"),
+    pytest.param(
+        _write_bytes(_dumps({"role": "robot", "content": "x"})),
+        ValueError, "Недопустимая роль", id="invalid_message"),
+])
+def test_load_errors(storage_path, writer, exc, match):
+    """Тест ошибок загрузки буфера из некорректных файлов."""
+    path = os.path.join(storage_path, "buffer.json")
+    if writer is not None:
+        writer(path)
+
+    memory = BufferMemory(max_messages=50)
+
+    with pytest.raises(exc, match=match):
+        memory.load(path)
+
+
+def test_clear():
+    """Тест очистки буфера."""
+    memory = BufferMemory(max_messages=50)
+    memory.add_message(Message(role="user", content="Сообщение"))
+
+    memory.clear()
+
+    assert len(memory) == 0
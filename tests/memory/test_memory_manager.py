@@ -0,0 +1,223 @@
+"""
+Тесты для менеджера локальной памяти MemoryManager.
+"""
+
+import os
+import sys
+
+import pytest
+
+# На уровне модуля импортируются только имена, нужные большинству тестов;
+# суммаризаторы и BufferMemory подгружаются внутри своих тестов, чтобы
+# выборочные запуски (-k) не тянули лишние имена при коллекции
+from multi_agent_system.memory.memory_manager import MemoryManager, Message
+from multi_agent_system.memory.storage import InMemoryStorage
+
+
+# Тексты сообщений строятся и интернируются один раз на модуль:
+# циклы в тестах переиспользуют одни и те же строковые объекты
+CONTENTS = tuple(sys.intern(f"Сообщение {i}") for i in range(16))
+
+
+class MockSummarizer:
+    """Заглушка суммаризатора, фиксирующая вызовы.
+
+    Определена на уровне модуля, чтобы не пересоздавать класс
+    в каждом тесте, которому нужна суммаризация.
+    """
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, messages, current_summary):
+        self.calls.append(len(messages))
+        return f"резюме {len(messages)} сообщений"
+
+
+@pytest.fixture(scope="module")
+def manager():
+    """Один менеджер памяти на весь модуль тестов.
+
+    Хранилище целиком в памяти процесса: тесты менеджера не трогают
+    диск и безопасны при параллельном запуске. Состояние очищается
+    между тестами автоматической фикстурой.
+    """
+    return MemoryManager(
+        storage_path="/memory",
+        max_messages=10,
+        storage=InMemoryStorage()
+    )
+
+
+@pytest.fixture(autouse=True)
+def _reset_manager(manager):
+    """Сбрасывает состояние общего менеджера после каждого теста."""
+    yield
+    manager.clear_all()
+
+
+def test_add_and_get_history(manager):
+    """Тест добавления сообщений и получения истории."""
+    for i in range(5):
+        manager.add_user_message("user1", CONTENTS[i])
+
+    history = manager.get_chat_history("user1")
+
+    assert len(history) == 5
+    assert history[0].content == "Сообщение 0"
+    assert all(message.role == "user" for message in history)
+
+
+def test_add_user_messages_bulk(manager):
+    """Тест пакетного добавления сообщений пользователя."""
+    manager.add_user_messages("user1", [CONTENTS[0], CONTENTS[1], CONTENTS[2]])
+
+    history = manager.get_chat_history("user1")
+
+    assert [message.content for message in history] == list(CONTENTS[:3])
+    # Весь пакет получает одну метку времени
+    assert len({message.timestamp for message in history}) == 1
+
+
+def test_assistant_message_metadata(manager):
+    """Тест сохранения имени агента в метаданных ответа."""
+    manager.add_user_message("user1", "Вопрос")
+    manager.add_assistant_message("user1", "Ответ", agent_name="test_agent")
+
+    history = manager.get_chat_history("user1")
+
+    assert history[-1].role == "assistant"
+    assert history[-1].metadata == {"agent_name": "test_agent"}
+
+
+def test_get_formatted_history(manager):
+    """Тест форматированной истории с фильтрацией системных сообщений."""
+    manager.add_system_message("user1", "Системное сообщение")
+    manager.add_user_message("user1", "Вопрос")
+    manager.add_assistant_message("user1", "Ответ")
+
+    formatted = manager.get_formatted_history("user1")
+    assert len(formatted) == 2
+    assert formatted[0] == {"role": "user", "content": "Вопрос"}
+
+    with_system = manager.get_formatted_history("user1", include_system_messages=True)
+    assert len(with_system) == 3
+    assert with_system[0]["role"] == "system"
+
+
+def test_persistence_roundtrip(manager):
+    """Тест сохранения истории на диск и загрузки новым менеджером."""
+    manager.add_user_message("user1", "Сообщение")
+
+    restored = MemoryManager(
+        storage_path=manager.storage_path,
+        max_messages=10,
+        storage=manager.storage
+    )
+    history = restored.get_chat_history("user1")
+
+    assert len(history) == 1
+    assert history[0].content == "Сообщение"
+
+
+def test_save_all(manager, monkeypatch):
+    """Тест сохранения памяти всех пользователей.
+
+    save подменяется на конкретных экземплярах буферов, а не на классе
+    BufferMemory: патч класса сбрасывает кеши методов CPython и влияет
+    на другие тесты в том же процессе.
+    """
+    manager.add_user_message("user1", "Сообщение 1")
+    manager.add_user_message("user2", "Сообщение 2")
+
+    saved = []
+    for user_id in ("user1", "user2"):
+        buffer = manager.get_buffer_memory(user_id)
+        monkeypatch.setattr(
+            buffer, "save",
+            lambda path, storage=None, user_id=user_id: saved.append(user_id)
+        )
+
+    manager.save_all()
+
+    assert sorted(saved) == ["user1", "user2"]
+
+
+def test_get_all_users(manager):
+    """Тест получения списка пользователей."""
+    manager.add_user_message("user1", "Сообщение")
+    manager.add_user_message("user2", "Сообщение")
+
+    users = manager.get_all_users()
+
+    assert sorted(users) == ["user1", "user2"]
+
+
+def test_clear(manager):
+    """Тест очистки памяти пользователя."""
+    manager.add_user_message("user1", "Сообщение")
+    buffer_path = manager._buffer_path("user1")
+    assert manager.storage.exists(buffer_path)
+
+    manager.clear("user1")
+
+    assert len(manager.get_chat_history("user1")) == 0
+    assert not manager.storage.exists(buffer_path)
+
+
+def test_summarization_triggered(tmp_path):
+    """Тест срабатывания суммаризации при превышении порога.
+
+    Суммаризация ленивая: добавление сообщений ее не вызывает,
+    она происходит при запросе контекста.
+    """
+    summarizer = MockSummarizer()
+
+    summarizing_manager = MemoryManager(
+        storage_path=str(tmp_path),
+        max_messages=10,
+        summarizer=summarizer,
+        summarize_threshold=3
+    )
+
+    for i in range(5):
+        summarizing_manager.add_user_message("user1", CONTENTS[i])
+
+    # До запроса контекста суммаризатор не вызывался
+    assert summarizer.calls == []
+
+    context = summarizing_manager.get_context("user1")
+
+    assert len(summarizer.calls) > 0
+    assert "резюме" in context
+
+
+def test_simple_summarizer():
+    """Тест простого суммаризатора."""
+    from multi_agent_system.memory.memory_manager import create_simple_summarizer
+
+    summarize = create_simple_summarizer(max_length=1000)
+    messages = [
+        Message(role="user", content="Привет"),
+        Message(role="assistant", content="Здравствуйте"),
+    ]
+
+    summary = summarize(messages, "")
+
+    assert "Привет" in summary
+    assert "Здравствуйте" in summary
+
+
+def test_keyword_summarizer():
+    """Тест суммаризатора по ключевым словам."""
+    from multi_agent_system.memory.memory_manager import create_keyword_summarizer
+
+    summarize = create_keyword_summarizer(top_n=2)
+    messages = [
+        Message(role="user", content="погода погода погода сегодня сегодня"),
+    ]
+
+    summary = summarize(messages, "")
+
+    assert "погода" in summary
+    assert "сегодня" in summary
@@ -0,0 +1,70 @@
+"""
+Тесты для класса Message и его сериализации.
+"""
+
+import pytest
+
+from multi_agent_system.memory.memory_manager import Message
+
+# Фиксированная метка времени: тестам сериализации не нужно реальное
+# текущее время, а константа делает их детерминированными
+FIXED_TIMESTAMP = "2025-01-01T12:00:00"
+
+
+def test_message_creation():
+    """Тест создания сообщения."""
+    message = Message(role="user", content="Привет")
+
+    assert message.role == "user"
+    assert message.content == "Привет"
+    assert message.timestamp is not None
+    assert message.metadata == {}
+
+
+def test_message_invalid_role():
+    """Тест создания сообщения с недопустимой ролью."""
+    with pytest.raises(ValueError, match="Недопустимая роль"):
+        Message(role="robot", content="Привет")
+
+
+def test_message_to_dict():
+    """Тест преобразования сообщения в словарь."""
+    message = Message(
+        role="assistant",
+        content="Ответ",
+        timestamp=FIXED_TIMESTAMP,
+        metadata={"agent_name": "test_agent"}
+    )
+
+    data = message.to_dict()
+
+    assert data["role"] == "assistant"
+    assert data["content"] == "Ответ"
+    assert data["timestamp"] == FIXED_TIMESTAMP
+    assert data["metadata"] == {"agent_name": "test_agent"}
+
+
+def test_message_roundtrip():
+    """Тест сериализации и десериализации сообщения."""
+    original = Message(role="system", content="Системное сообщение")
+    restored = Message.from_dict(original.to_dict())
+
+    assert restored.role == original.role
+    assert restored.content == original.content
+    assert restored.timestamp == original.timestamp
+
+
+# match закрепляет конкретную ветку валидации, а не просто тип ошибки
+@pytest.mark.parametrize("payload,match", [
+    (None, "должны быть словарем"),
+    ("не словарь", "должны быть словарем"),
+    ({}, "обязательные поля"),
+    ({"role": "user"}, "обязательные поля"),
+    ({"content": "без роли"}, "обязательные поля"),
+    ({"role": "robot", "content": "недопустимая роль",
+      "timestamp": FIXED_TIMESTAMP}, "Недопустимая роль"),
+])
+def test_invalid_message_deserialization(payload, match):
+    """Тест десериализации некорректных данных."""
+    with pytest.raises(ValueError, match=match):
+        Message.from_dict(payload)
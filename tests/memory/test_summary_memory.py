@@ -0,0 +1,105 @@
+"""
+Тесты для суммаризирующей памяти SummaryMemory.
+"""
+
+import pytest
+
+from multi_agent_system.memory.memory_manager import Message, SummaryMemory
+
+
+# Сообщения создаются один раз на модуль: продакшен-код их только
+# читает, поэтому разделять экземпляры между тестами безопасно
+@pytest.fixture(scope="module")
+def sample_messages():
+    """Неизменяемый набор сообщений, общий для тестов модуля."""
+    return tuple(Message(role="user", content=f"Сообщение {i}") for i in range(10))
+
+
+@pytest.fixture
+def make_memory():
+    """Фабрика памяти с суммаризатором-заглушкой, считающим вызовы.
+
+    У возвращенной памяти суммаризатор доступен как memory.summarizer
+    и хранит размеры переданных пакетов в атрибуте calls.
+    """
+    def _make(summarize_threshold=3, **kwargs):
+        calls = []
+
+        def summarize(messages, current_summary):
+            calls.append(len(messages))
+            return f"резюме {sum(calls)} сообщений"
+
+        summarize.calls = calls
+        return SummaryMemory(
+            summarizer=summarize,
+            summarize_threshold=summarize_threshold,
+            **kwargs
+        )
+
+    return _make
+
+
+def test_add_below_threshold_keeps_buffer(make_memory, sample_messages):
+    """Тест: до порога сообщения копятся в буфере без суммаризации."""
+    memory = make_memory(summarize_threshold=5)
+
+    for message in sample_messages[:3]:
+        memory.add_message(message)
+
+    assert memory.summarizer.calls == []
+    assert memory.summary == ""
+    assert len(memory.buffer) == 3
+
+
+def test_summarization_over_threshold(make_memory, sample_messages):
+    """Тест суммаризации старой части буфера при превышении порога."""
+    memory = make_memory(summarize_threshold=3)
+
+    for message in sample_messages[:5]:
+        memory.add_message(message)
+
+    assert len(memory.summarizer.calls) > 0
+    assert "резюме" in memory.summary
+    assert len(memory.buffer) <= 3
+
+
+def test_get_context_contains_summary_and_messages(make_memory, sample_messages):
+    """Тест контекста: резюме плюс последние сообщения."""
+    memory = make_memory(summarize_threshold=2)
+
+    for message in sample_messages[:4]:
+        memory.add_message(message)
+
+    context = memory.get_context()
+
+    assert "Резюме диалога" in context
+    assert "Сообщение 3" in context
+
+
+def test_get_keywords_streaming():
+    """Тест потокового счетчика ключевых слов."""
+    memory = SummaryMemory(summarize_threshold=10)
+
+    memory.add_message(Message(role="user", content="погода погода сегодня"))
+    memory.add_message(Message(role="user", content="погода завтра"))
+
+    keywords = memory.get_keywords(top_n=2)
+
+    assert keywords[0] == "погода"
+    assert "сегодня" in memory.get_keywords(top_n=3)
+
+
+def test_save_and_load_roundtrip(storage_file, sample_messages):
+    """Тест сохранения и загрузки суммаризирующей памяти."""
+    memory = SummaryMemory(summarize_threshold=2)
+    for message in sample_messages[:4]:
+        memory.add_message(message)
+    memory.save(storage_file)
+
+    restored = SummaryMemory(summarize_threshold=2)
+    restored.load(storage_file)
+
+    assert restored.summary == memory.summary
+    assert len(restored.buffer) == len(memory.buffer)
+    # Счетчик ключевых слов восстанавливается по загруженному буферу
+    assert restored.get_keywords(top_n=1) != []
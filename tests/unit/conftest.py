@@ -0,0 +1,39 @@
+"""
+Общие фикстуры и заглушки для юнит-тестов.
+
+Модуль multi_agent_system.langchain_integration.langchain_router может
+отсутствовать в окружении, поэтому заглушка устанавливается в
+sys.modules один раз на сессию — до импорта любого тестового файла.
+setdefault не перетирает настоящий модуль, если он доступен.
+"""
+
+import sys
+import types
+
+
+class StubLangChainRouter:
+    """Легковесная заглушка LangChainRouter.
+
+    Обычный класс вместо Mock: без прокси-атрибутов MagicMock
+    на каждом обращении и с честной сигнатурой route_message.
+    """
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def get_last_used_agent(self):
+        return "mock_agent"
+
+    async def route_message(self, message, user_id, history=None):
+        return {
+            "response": "Response from LangChain Router",
+            "agent_name": "mock_agent",
+            "processing_time": 0.5
+        }
+
+
+_stub_module = types.ModuleType(
+    "multi_agent_system.langchain_integration.langchain_router"
+)
+_stub_module.LangChainRouter = StubLangChainRouter
+sys.modules.setdefault(_stub_module.__name__, _stub_module)
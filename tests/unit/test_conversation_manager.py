@@ -0,0 +1,68 @@
+"""
+Тесты для менеджера диалогов телеграм-бота.
+
+Каждый тест получает собственный ConversationManager через фикстуру:
+тесты не разделяют изменяемое состояние и безопасны при параллельном
+запуске через pytest-xdist.
+"""
+
+import pytest
+
+from telegram_bot.config import MAX_HISTORY_LENGTH
+from telegram_bot.conversation_manager import Conversation, ConversationManager
+
+
+@pytest.fixture
+def manager():
+    """Свежий менеджер диалогов на каждый тест."""
+    return ConversationManager()
+
+
+def test_add_and_get_messages(manager):
+    """Тест добавления сообщений и получения истории в формате словарей."""
+    manager.add_user_message(1, "Вопрос")
+    manager.add_assistant_message(1, "Ответ")
+
+    messages = manager.get_messages(1)
+
+    assert messages == [
+        {"role": "user", "content": "Вопрос"},
+        {"role": "assistant", "content": "Ответ"},
+    ]
+
+
+def test_history_is_bounded(manager):
+    """Тест ограничения длины истории кольцевым буфером."""
+    for i in range(MAX_HISTORY_LENGTH + 5):
+        manager.add_user_message(1, f"Сообщение {i}")
+
+    messages = manager.get_messages(1)
+
+    assert len(messages) == MAX_HISTORY_LENGTH
+    assert messages[-1]["content"] == f"Сообщение {MAX_HISTORY_LENGTH + 4}"
+
+
+def test_conversations_are_isolated(manager):
+    """Тест изоляции историй разных пользователей."""
+    manager.add_user_message(1, "Первый")
+    manager.add_user_message(2, "Второй")
+
+    assert manager.get_messages(1) == [{"role": "user", "content": "Первый"}]
+    assert manager.get_messages(2) == [{"role": "user", "content": "Второй"}]
+
+
+def test_reset_conversation(manager):
+    """Тест сброса разговора пользователя."""
+    manager.add_user_message(1, "Сообщение")
+
+    manager.reset_conversation(1)
+
+    assert manager.get_messages(1) == []
+
+
+def test_reset_unknown_user_creates_conversation(manager):
+    """Тест сброса для пользователя без истории."""
+    manager.reset_conversation(42)
+
+    assert isinstance(manager.get_conversation(42), Conversation)
+    assert manager.get_messages(42) == []
@@ -2,181 +2,173 @@
 Тесты для модуля интеграции памяти с аналитикой.
 """
 
-import os
-import sys
-import unittest
-from unittest.mock import Mock, patch
-
-# Добавляем корневую директорию проекта в путь для импорта
-current_dir = os.path.dirname(os.path.abspath(__file__))
-project_root = os.path.dirname(os.path.dirname(current_dir))
-if project_root not in sys.path:
-    sys.path.append(project_root)
+from unittest.mock import Mock
 
+import pytest
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
 
 from multi_agent_system.memory.memory_analytics_integration import MemoryAnalyticsIntegration, extract_performance_metrics_from_memory
 
 
-class TestMemoryAnalyticsIntegration(unittest.TestCase):
+# История диалога строится один раз на модуль: конструктор langchain-сообщений
+# проходит pydantic-валидацию, повторять её в каждом тесте незачем.
+# Тесты получают копию списка, кортеж-оригинал не мутируется
+_CHAT_HISTORY = (
+    SystemMessage(content="System message"),
+    HumanMessage(content="Hello, how are you?"),
+    AIMessage(content="I'm doing well, thanks for asking!", additional_kwargs={"agent_name": "test_agent"}),
+    HumanMessage(content="What's the weather like?"),
+    AIMessage(content="It's sunny today!", additional_kwargs={"agent_name": "weather_agent"})
+)
+
+
+@pytest.fixture(scope="class")
+def env():
+    """Пара моков и интеграция, общие для всего тестового класса."""
+    memory_manager = Mock()
+    data_collector = Mock()
+    integration = MemoryAnalyticsIntegration(
+        memory_manager=memory_manager,
+        data_collector=data_collector
+    )
+    return memory_manager, data_collector, integration
+
+
+class TestMemoryAnalyticsIntegration:
     """
     Тесты для класса MemoryAnalyticsIntegration.
+
+    Моки и интеграция строятся один раз на класс: reset_mock между
+    тестами заметно дешевле, чем конструирование заново в setUp.
     """
-    
-    def setUp(self):
-        """
-        Подготовка к тестам.
-        """
-        self.memory_manager = Mock()
-        self.data_collector = Mock()
-        self.integration = MemoryAnalyticsIntegration(
-            memory_manager=self.memory_manager,
-            data_collector=self.data_collector
-        )
-    
-    def test_init(self):
+
+    @pytest.fixture(autouse=True)
+    def _reset(self, env):
+        """Сбрасывает записи вызовов перед каждым тестом."""
+        memory_manager, data_collector, _ = env
+        memory_manager.reset_mock()
+        data_collector.reset_mock()
+
+    def test_init(self, env):
         """
         Тест инициализации класса.
         """
-        self.assertEqual(self.integration.memory_manager, self.memory_manager)
-        self.assertEqual(self.integration.data_collector, self.data_collector)
-    
-    def test_process_conversation_history(self):
+        memory_manager, data_collector, integration = env
+        assert integration.memory_manager is memory_manager
+        assert integration.data_collector is data_collector
+
+    def test_process_conversation_history(self, env):
         """
         Тест обработки истории разговора.
         """
+        memory_manager, data_collector, integration = env
+
         # Мокаем получение истории диалога
         user_id = "test_user"
-        chat_history = [
-            SystemMessage(content="System message"),
-            HumanMessage(content="Hello, how are you?"),
-            AIMessage(content="I'm doing well, thanks for asking!", additional_kwargs={"agent_name": "test_agent"}),
-            HumanMessage(content="What's the weather like?"),
-            AIMessage(content="It's sunny today!", additional_kwargs={"agent_name": "weather_agent"})
-        ]
-        self.memory_manager.get_chat_history.return_value = chat_history
-        
+        memory_manager.get_chat_history.return_value = list(_CHAT_HISTORY)
+
         # Мокаем успешную запись в аналитику
-        self.data_collector.record_interaction.return_value = True
-        
+        data_collector.record_interaction.return_value = True
+
         # Вызываем тестируемый метод
-        result = self.integration.process_conversation_history(user_id=user_id)
-        
+        result = integration.process_conversation_history(user_id=user_id)
+
         # Проверяем результаты
-        self.assertEqual(result, 2)  # Должно быть обработано 2 взаимодействия
-        self.memory_manager.get_chat_history.assert_called_once_with(user_id)
-        self.assertEqual(self.data_collector.record_interaction.call_count, 2)
-    
-    def test_process_all_users(self):
+        assert result == 2  # Должно быть обработано 2 взаимодействия
+        memory_manager.get_chat_history.assert_called_once_with(user_id)
+        assert data_collector.record_interaction.call_count == 2
+
+    def test_process_all_users(self, env, monkeypatch):
         """
         Тест обработки истории всех пользователей.
         """
+        memory_manager, data_collector, integration = env
+
         # Мокаем получение списка пользователей
         users = ["user1", "user2"]
-        self.memory_manager.get_all_users.return_value = users
-        
-        # Мокаем обработку истории каждого пользователя
+        memory_manager.get_all_users.return_value = users
+
+        # Мокаем обработку истории каждого пользователя; monkeypatch
+        # вернет настоящий метод после теста — интеграция общая на класс
         def mock_process_history(user_id, session_id, last_n_interactions):
             return 3 if user_id == "user1" else 2
-        
-        self.integration.process_conversation_history = Mock(side_effect=mock_process_history)
-        
+
+        process_mock = Mock(side_effect=mock_process_history)
+        monkeypatch.setattr(integration, "process_conversation_history", process_mock)
+
         # Вызываем тестируемый метод
-        result = self.integration.process_all_users(last_n_interactions=10)
-        
+        result = integration.process_all_users(last_n_interactions=10)
+
         # Проверяем результаты
-        self.assertEqual(result, {"user1": 3, "user2": 2})
-        self.memory_manager.get_all_users.assert_called_once()
-        self.assertEqual(self.integration.process_conversation_history.call_count, 2)
-    
-    def test_analyze_user_conversation_patterns(self):
+        assert result == {"user1": 3, "user2": 2}
+        memory_manager.get_all_users.assert_called_once()
+        assert process_mock.call_count == 2
+
+    def test_analyze_user_conversation_patterns(self, env):
         """
         Тест анализа паттернов разговора пользователя.
         """
+        memory_manager, data_collector, integration = env
+
         # Мокаем получение истории диалога
         user_id = "test_user"
-        chat_history = [
-            SystemMessage(content="System message"),
-            HumanMessage(content="Hello, how are you?"),
-            AIMessage(content="I'm doing well, thanks for asking!"),
-            HumanMessage(content="What's the weather like?"),
-            AIMessage(content="It's sunny today!")
-        ]
-        self.memory_manager.get_chat_history.return_value = chat_history
-        
+        memory_manager.get_chat_history.return_value = list(_CHAT_HISTORY)
+
         # Вызываем тестируемый метод
-        result = self.integration.analyze_user_conversation_patterns(user_id=user_id)
-        
+        result = integration.analyze_user_conversation_patterns(user_id=user_id)
+
         # Проверяем результаты
-        self.assertEqual(result["total_messages"], 5)
-        self.assertEqual(result["user_messages"], 2)
-        self.assertEqual(result["ai_messages"], 2)
-        self.assertEqual(result["system_messages"], 1)
-        self.memory_manager.get_chat_history.assert_called_once_with(user_id)
+        assert result["total_messages"] == 5
+        assert result["user_messages"] == 2
+        assert result["ai_messages"] == 2
+        assert result["system_messages"] == 1
+        memory_manager.get_chat_history.assert_called_once_with(user_id)
 
 
-class TestExtractPerformanceMetrics(unittest.TestCase):
+def test_extract_performance_metrics():
     """
-    Тесты для функции extract_performance_metrics_from_memory.
+    Тест извлечения метрик производительности.
+
+    Вызывается настоящая функция: прежний вариант патчил её же
+    и проверял лишь поведение собственной заглушки.
     """
-    
-    def test_extract_performance_metrics(self):
-        """
-        Тест извлечения метрик производительности.
-        """
-        # Создаем моки для менеджера памяти и коллектора данных
-        memory_manager = Mock()
-        data_collector = Mock()
-        
-        # Настраиваем мок для получения истории чата
-        chat_history = [
-            {"role": "user", "content": "Привет"},
-            {"role": "assistant", "content": "Здравствуйте!"},
-            {"role": "user", "content": "Как дела?"},
-            {"role": "assistant", "content": "Отлично!"}
-        ]
-        memory_manager.get_all_users.return_value = ["user1", "user2"]
-        memory_manager.get_chat_history.return_value = chat_history
-        
-        # Настраиваем мок для извлечения метрик
-        agent_interactions = [
-            {"user_id": "user1", "agent_name": "agent1", "success": True, "response_time": 0.5},
-            {"user_id": "user1", "agent_name": "agent2", "success": False, "response_time": 1.0},
-            {"user_id": "user2", "agent_name": "agent1", "success": True, "response_time": 0.3}
-        ]
-        data_collector.get_all_interactions.return_value = agent_interactions
-        data_collector.get_average_response_time.return_value = 0.6
-        data_collector.get_success_rate.return_value = 0.67
-        data_collector.get_total_conversations.return_value = 3
-        
-        # Создаем мок для функции extract_performance_metrics_from_memory
-        def mock_extract_metrics(memory_manager, data_collector):
-            return {
-                "average_response_time": data_collector.get_average_response_time(),
-                "success_rate": data_collector.get_success_rate(),
-                "total_conversations": data_collector.get_total_conversations()
-            }
-        
-        # Патчим функцию
-        with patch('multi_agent_system.memory.memory_analytics_integration.extract_performance_metrics_from_memory', 
-                  side_effect=mock_extract_metrics):
-            # Вызываем тестируемую функцию
-            result = extract_performance_metrics_from_memory(
-                memory_manager=memory_manager,
-                data_collector=data_collector
-            )
-        
-        # Проверяем результаты
-        self.assertEqual(result["average_response_time"], 0.6)
-        self.assertEqual(result["success_rate"], 0.67)
-        self.assertEqual(result["total_conversations"], 3)
-        
-        # Проверяем, что методы были вызваны с правильными параметрами
-        memory_manager.get_all_users.assert_called_once()
-        data_collector.get_average_response_time.assert_called_once()
-        data_collector.get_success_rate.assert_called_once()
-        data_collector.get_total_conversations.assert_called_once()
+    # Создаем моки для менеджера памяти и коллектора данных
+    memory_manager = Mock()
+    data_collector = Mock()
+
+    # Настраиваем мок для получения истории чата: по два полных
+    # взаимодействия "запрос-ответ" на каждого пользователя
+    chat_history = [
+        HumanMessage(content="Привет"),
+        AIMessage(content="Здравствуйте!", additional_kwargs={"agent_name": "agent1"}),
+        HumanMessage(content="Как дела?"),
+        AIMessage(content="Отлично!", additional_kwargs={"agent_name": "agent2"})
+    ]
+    memory_manager.get_all_users.return_value = ["user1", "user2"]
+    memory_manager.get_chat_history.return_value = chat_history
+    data_collector.record_interaction.return_value = True
+
+    # Распределение агентов строится по данным коллектора
+    agent_interactions = [
+        {"user_id": "user1", "agent_name": "agent1", "success": True, "response_time": 0.5},
+        {"user_id": "user1", "agent_name": "agent2", "success": False, "response_time": 1.0},
+        {"user_id": "user2", "agent_name": "agent1", "success": True, "response_time": 0.3}
+    ]
+    data_collector.get_agent_interactions.return_value = agent_interactions
+
+    # Вызываем тестируемую функцию
+    result = extract_performance_metrics_from_memory(
+        memory_manager=memory_manager,
+        data_collector=data_collector
+    )
 
+    # Проверяем результаты
+    assert result["total_conversations"] == 2
+    assert result["total_interactions"] == 4
+    assert result["agent_distribution"] == {"agent1": 2, "agent2": 1}
 
-if __name__ == '__main__':
-    unittest.main()
+    # Проверяем, что методы были вызваны с правильными параметрами:
+    # список пользователей запрашивается самой функцией и process_all_users
+    assert memory_manager.get_all_users.call_count == 2
+    data_collector.get_agent_interactions.assert_called_once()
+    assert data_collector.record_interaction.call_count == 4
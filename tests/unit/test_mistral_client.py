@@ -0,0 +1,131 @@
+"""
+Тесты для асинхронного клиента Mistral API.
+
+Все асинхронные тесты выполняются в одном событийном цикле уровня
+модуля: создание и остановка цикла на каждый тест дороже самих
+корутин. Сетевые вызовы подменяются ручными заглушками aiohttp —
+они дешевле MagicMock и не требуют реального сервера.
+"""
+
+import asyncio
+
+import aiohttp
+import pytest
+
+from telegram_bot.mistral_client import MistralClient
+
+
+@pytest.fixture(scope="module")
+def event_loop():
+    """Один событийный цикл на модуль тестов."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture
+def client():
+    """Клиент с фиктивным адресом: сеть в тестах не используется."""
+    return MistralClient(base_url="http://localhost:9999")
+
+
+class _StubResponse:
+    """Успешный HTTP-ответ с JSON-телом."""
+
+    status = 200
+
+    async def text(self):
+        return ""
+
+    async def json(self):
+        return {"content": "  Ответ модели  "}
+
+
+class _StubPost:
+    """Асинхронный контекстный менеджер session.post."""
+
+    async def __aenter__(self):
+        return _StubResponse()
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class _StubSession:
+    """Сессия aiohttp, возвращающая успешный ответ."""
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def post(self, *args, **kwargs):
+        return _StubPost()
+
+
+class _FailingSession(_StubSession):
+    """Сессия aiohttp, падающая ошибкой соединения."""
+
+    def post(self, *args, **kwargs):
+        raise aiohttp.ClientError("нет соединения")
+
+
+def test_generate_response_success(event_loop, client, monkeypatch):
+    """Тест успешной генерации ответа."""
+    monkeypatch.setattr(
+        "telegram_bot.mistral_client.aiohttp.ClientSession", _StubSession
+    )
+
+    result = event_loop.run_until_complete(client.generate_response("Привет"))
+
+    assert result == "Ответ модели"
+
+
+def test_generate_response_connection_error(event_loop, client, monkeypatch):
+    """Тест обработки ошибки соединения."""
+    monkeypatch.setattr(
+        "telegram_bot.mistral_client.aiohttp.ClientSession", _FailingSession
+    )
+
+    result = event_loop.run_until_complete(client.generate_response("Привет"))
+
+    assert "ошибка при подключении" in result
+
+
+def test_generate_chat_response_delegates(event_loop, client, monkeypatch):
+    """Тест: ответ по истории строится через generate_response."""
+    received = {}
+
+    async def fake_generate(prompt, temperature, max_tokens):
+        received["prompt"] = prompt
+        return "Ответ"
+
+    monkeypatch.setattr(client, "generate_response", fake_generate)
+
+    result = event_loop.run_until_complete(client.generate_chat_response([
+        {"role": "system", "content": "Системный промпт"},
+        {"role": "user", "content": "Вопрос"},
+    ]))
+
+    assert result == "Ответ"
+    assert "Системный промпт" in received["prompt"]
+    assert "Вопрос" in received["prompt"]
+
+
+def test_convert_messages_empty(client):
+    """Тест промпта по умолчанию для пустой истории."""
+    prompt = client._convert_messages_to_prompt([])
+
+    assert prompt == "Привет! Чем я могу помочь?"
+
+
+def test_convert_messages_uses_last_user_message(client):
+    """Тест: в промпт попадает только последнее сообщение пользователя."""
+    prompt = client._convert_messages_to_prompt([
+        {"role": "user", "content": "Первый вопрос"},
+        {"role": "assistant", "content": "Ответ"},
+        {"role": "user", "content": "Второй вопрос"},
+    ])
+
+    assert prompt == "Второй вопрос"
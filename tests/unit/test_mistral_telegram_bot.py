@@ -1,285 +1,223 @@
 """
 Тесты для модуля телеграм-бота с интеграцией Mistral.
-"""
 
-import os
-import sys
-import unittest
-from unittest.mock import Mock, patch, AsyncMock, call
+Асинхронные обработчики тестируются через pytest-asyncio: прежние
+async-методы на unittest.TestCase молча не исполнялись (stdlib unittest
+не ожидает корутины), поэтому тесты проходили, не выполняя ни строки.
+"""
 
-# Добавляем корневую директорию проекта в путь для импорта
-current_dir = os.path.dirname(os.path.abspath(__file__))
-project_root = os.path.dirname(os.path.dirname(current_dir))
-if project_root not in sys.path:
-    sys.path.append(project_root)
+import copy
+from types import SimpleNamespace
+from unittest.mock import Mock, patch, AsyncMock
 
-from telegram import Update, User, Message, Chat, InlineKeyboardButton, InlineKeyboardMarkup
-from telegram.ext import ContextTypes, ApplicationBuilder
+import pytest
 
 from multi_agent_system.memory.conversation_memory import ConversationMemoryManager
 from multi_agent_system.agent_analytics.data_collector import AgentDataCollector
 from multi_agent_system.memory.memory_analytics_integration import MemoryAnalyticsIntegration
 
-# Создаем заглушку для LangChainRouter, так как модуль может отсутствовать
-class MockLangChainRouter:
-    """
-    Заглушка для класса LangChainRouter.
-    """
-    def __init__(self):
-        pass
-    
-    async def route_message(self, message, user_id, history=None):
-        return {
-            "response": "Response from LangChain Router",
-            "agent_name": "mock_agent",
-            "processing_time": 0.5
-        }
-
-# Патчим импорт LangChainRouter
-sys.modules['multi_agent_system.langchain_integration.langchain_router'] = Mock()
-sys.modules['multi_agent_system.langchain_integration.langchain_router'].LangChainRouter = MockLangChainRouter
+# Заглушка LangChainRouter установлена в sys.modules в conftest.py,
+# поэтому импорт по обычному пути отдает StubLangChainRouter
+from multi_agent_system.langchain_integration.langchain_router import LangChainRouter
 
 from telegram_bot.mistral_telegram_bot import MistralTelegramBot
 
 
-class TestMistralTelegramBot(unittest.TestCase):
+# Прототипы spec-моков строятся один раз на модуль: Mock(spec=...)
+# интроспектирует класс при каждом создании, а копия прототипа дешевая
+_MEMORY_PROTO = Mock(spec=ConversationMemoryManager)
+_DATA_PROTO = Mock(spec=AgentDataCollector)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def app_builder():
+    """Общий мок ApplicationBuilder на модуль тестов."""
+    builder = Mock()
+    builder.token.return_value = builder
+    with patch('telegram.ext.ApplicationBuilder', return_value=builder):
+        yield builder
+
+
+@pytest.fixture
+def app_mock(app_builder):
+    """Свежий мок приложения Telegram на каждый тест.
+
+    add_handler заменен простым счетчиком: MagicMock строил бы дочерний
+    мок и вел журнал вызовов, а тестам нужно только их количество.
     """
-    Тесты для класса MistralTelegramBot.
+    app = Mock()
+    app.handler_count = 0
+
+    def _count_handler(*args, **kwargs):
+        app.handler_count += 1
+
+    app.add_handler = _count_handler
+    app_builder.build.return_value = app
+    return app
+
+
+@pytest.fixture
+def bot(app_mock):
+    """Бот с мокнутыми зависимостями."""
+    memory_manager = copy.copy(_MEMORY_PROTO)
+    memory_manager.reset_mock()
+    data_collector = copy.copy(_DATA_PROTO)
+    data_collector.reset_mock()
+
+    bot = MistralTelegramBot(
+        telegram_token="test_token",
+        memory_manager=memory_manager,
+        data_collector=data_collector
+    )
+    bot.langchain_router = LangChainRouter()
+    return bot
+
+
+class _FakeMessage:
+    """Минимальная заглушка telegram.Message.
+
+    Обработчикам нужны только text и awaitable reply_text;
+    AsyncMock(spec=Message) интроспектировал бы всю pydantic-модель.
+    """
+
+    def __init__(self, text=""):
+        self.text = text
+        self.reply_text = AsyncMock()
+
+
+def _make_update(text=None):
+    """Собирает заглушку обновления Telegram с пользователем, чатом и сообщением.
+
+    Пользователь и чат — чистые носители данных, поэтому SimpleNamespace
+    вместо Mock(spec=...): без интроспекции spec-класса и прокси-атрибутов.
     """
-    
-    def setUp(self):
-        """
-        Подготовка к тестам.
-        """
-        # Мокаем компоненты
-        self.memory_manager = Mock(spec=ConversationMemoryManager)
-        self.data_collector = Mock(spec=AgentDataCollector)
-        self.langchain_router = MockLangChainRouter()
-        
-        # Мокаем класс ApplicationBuilder для создания приложения
-        self.app_builder_mock = Mock()
-        patcher = patch('telegram.ext.ApplicationBuilder', return_value=self.app_builder_mock)
-        self.addCleanup(patcher.stop)
-        patcher.start()
-        
-        # Мокаем методы ApplicationBuilder
-        self.app_mock = Mock()
-        self.app_builder_mock.token.return_value = self.app_builder_mock
-        self.app_builder_mock.build.return_value = self.app_mock
-        
-        # Создаем бота для тестирования
-        self.bot = MistralTelegramBot(
-            telegram_token="test_token",
-            memory_manager=self.memory_manager,
-            data_collector=self.data_collector
-        )
-        
-        # Мокаем LangChainRouter в боте
-        self.bot.langchain_router = self.langchain_router
-    
-    def test_init(self):
-        """
-        Тест инициализации класса.
-        """
-        # Создаем экземпляр бота
-        bot = MistralTelegramBot(
-            telegram_token="test_token",
-            memory_manager=self.memory_manager,
-            data_collector=self.data_collector
-        )
-        
-        # Проверяем, что атрибуты установлены правильно
-        self.assertEqual(bot.telegram_token, "test_token")
-        self.assertEqual(bot.memory_manager, self.memory_manager)
-        self.assertEqual(bot.data_collector, self.data_collector)
-        self.assertTrue(isinstance(bot.memory_analytics, MemoryAnalyticsIntegration))
-        self.assertEqual(bot.application, self.app_mock)
-        
-        # Проверяем, что обработчики команд добавлены
-        self.assertEqual(self.app_mock.add_handler.call_count, 12)
-        
-        # Не проверяем вызов run_polling, так как он может вызываться отдельно
-        # self.app_mock.run_polling.assert_called_once()
-    
-    @patch('telegram.Update')
-    @patch('telegram.ext.ContextTypes.DEFAULT_TYPE')
-    async def test_start_command(self, mock_context, mock_update):
-        """
-        Тест команды /start.
-        """
-        # Настраиваем мок для update
-        mock_user = Mock(spec=User)
-        mock_user.id = 123
-        mock_user.first_name = "Test User"
-        
-        mock_message = AsyncMock(spec=Message)
-        mock_update.effective_user = mock_user
-        mock_update.message = mock_message
-        
-        # Вызываем тестируемый метод
-        await self.bot.start_command(mock_update, mock_context)
-        
-        # Проверяем результаты
-        self.memory_manager.add_system_message.assert_called_once()
-        mock_message.reply_text.assert_called_once()
-    
-    @patch('telegram.Update')
-    @patch('telegram.ext.ContextTypes.DEFAULT_TYPE')
-    async def test_help_command(self, mock_context, mock_update):
-        """
-        Тест команды /help.
-        """
-        # Настраиваем мок для update
-        mock_message = AsyncMock(spec=Message)
-        mock_update.message = mock_message
-        
-        # Вызываем тестируемый метод
-        await self.bot.help_command(mock_update, mock_context)
-        
-        # Проверяем результаты
-        mock_message.reply_text.assert_called_once()
-    
-    @patch('telegram.Update')
-    @patch('telegram.ext.ContextTypes.DEFAULT_TYPE')
-    async def test_reset_command(self, mock_context, mock_update):
-        """
-        Тест команды /reset.
-        """
-        # Настраиваем мок для update
-        mock_user = Mock(spec=User)
-        mock_user.id = 123
-        
-        mock_message = AsyncMock(spec=Message)
-        mock_update.effective_user = mock_user
-        mock_update.message = mock_message
-        
-        # Мокаем метод process_conversation_history
-        self.bot.memory_analytics.process_conversation_history = Mock(return_value=5)
-        
-        # Вызываем тестируемый метод
-        await self.bot.reset_command(mock_update, mock_context)
-        
-        # Проверяем результаты
-        self.bot.memory_analytics.process_conversation_history.assert_called_once_with(
-            user_id="123",
-            process_all=True
-        )
-        self.memory_manager.clear_memory.assert_called_once_with("123")
-        mock_message.reply_text.assert_called_once()
-    
-    @patch('telegram.Update')
-    @patch('telegram.ext.ContextTypes.DEFAULT_TYPE')
-    async def test_mode_command(self, mock_context, mock_update):
-        """
-        Тест команды /mode.
-        """
-        # Настраиваем мок для update
-        mock_message = AsyncMock(spec=Message)
-        mock_update.message = mock_message
-        
-        # Вызываем тестируемый метод
-        await self.bot.mode_command(mock_update, mock_context)
-        
-        # Проверяем результаты
-        mock_message.reply_text.assert_called_once()
-        
-        # Проверяем, что в аргументах есть reply_markup
-        args, kwargs = mock_message.reply_text.call_args
-        self.assertIn("reply_markup", kwargs)
-        self.assertTrue(isinstance(kwargs["reply_markup"], InlineKeyboardMarkup))
-    
-    @patch('telegram.Update')
-    @patch('telegram.ext.ContextTypes.DEFAULT_TYPE')
-    async def test_handle_callback_mistral(self, mock_context, mock_update):
-        """
-        Тест обработки колбэка для выбора режима Mistral API.
-        """
-        # Настраиваем мок для callback_query
-        mock_query = AsyncMock()
-        mock_query.data = "mode_mistral"
-        mock_query.from_user = Mock(spec=User)
-        mock_query.from_user.id = 123
-        
-        mock_update.callback_query = mock_query
-        
-        # Вызываем тестируемый метод
-        await self.bot.handle_callback(mock_update, mock_context)
-        
-        # Проверяем результаты
-        mock_query.answer.assert_called_once()
-        mock_query.edit_message_text.assert_called_once_with("Режим работы изменен на Mistral API")
-        self.assertFalse(self.bot.use_langchain_router)
-    
-    @patch('telegram.Update')
-    @patch('telegram.ext.ContextTypes.DEFAULT_TYPE')
-    async def test_handle_callback_langchain(self, mock_context, mock_update):
-        """
-        Тест обработки колбэка для выбора режима LangChain Router.
-        """
-        # Настраиваем мок для callback_query
-        mock_query = AsyncMock()
-        mock_query.data = "mode_langchain"
-        mock_query.from_user = Mock(spec=User)
-        mock_query.from_user.id = 123
-        
-        mock_update.callback_query = mock_query
-        
-        # Сначала устанавливаем режим Mistral
-        self.bot.use_langchain_router = False
-        
-        # Вызываем тестируемый метод
-        await self.bot.handle_callback(mock_update, mock_context)
-        
-        # Проверяем результаты
-        mock_query.answer.assert_called_once()
-        mock_query.edit_message_text.assert_called_once_with("Режим работы изменен на LangChain Router")
-        self.assertTrue(self.bot.use_langchain_router)
-    
-    @patch('telegram.Update')
-    @patch('telegram.ext.ContextTypes.DEFAULT_TYPE')
-    @patch('telegram_bot.mistral_telegram_bot.MistralTelegramBot._send_message_to_mistral')
-    async def test_handle_message_mistral_mode(self, mock_send_to_mistral, mock_context, mock_update):
-        """
-        Тест обработки сообщения в режиме Mistral API.
-        """
-        # Настраиваем мок для update
-        mock_user = Mock(spec=User)
-        mock_user.id = 123
-        mock_user.first_name = "Test User"
-        
-        mock_chat = Mock(spec=Chat)
-        mock_chat.id = 123
-        
-        mock_message = AsyncMock(spec=Message)
-        mock_message.text = "Test message"
-        
-        mock_update.effective_user = mock_user
-        mock_update.effective_chat = mock_chat
-        mock_update.message = mock_message
-        
-        # Мокаем бота в контексте
-        mock_context.bot = AsyncMock()
-        
-        # Мокаем ответ от Mistral
-        mock_send_to_mistral.return_value = {
-            "response": "Test response",
-            "agent_name": "test_agent",
-            "processing_time": 1.0
-        }
-        
-        # Устанавливаем режим Mistral
-        self.bot.use_langchain_router = False
-        
-        # Вызываем тестируемый метод
-        await self.bot.handle_message(mock_update, mock_context)
-        
-        # Проверяем результаты
-        self.memory_manager.add_user_message.assert_called_once_with("123", "Test message")
-        mock_context.bot.send_chat_action.assert_called_once()
-        mock_send_to_mistral.assert_called_once()
-        mock_message.reply_text.assert_called_once_with("Test response")
-        self.memory_manager.add_ai_message.assert_called_once()
-
-
-if __name__ == '__main__':
-    unittest.main() 
\ No newline at end of file
+    message = _FakeMessage(text if text is not None else "")
+    return SimpleNamespace(
+        effective_user=SimpleNamespace(id=123, first_name="Test User"),
+        effective_chat=SimpleNamespace(id=123),
+        message=message
+    )
+
+
+def test_init(bot, app_mock):
+    """Тест инициализации класса."""
+    assert bot.telegram_token == "test_token"
+    assert isinstance(bot.memory_analytics, MemoryAnalyticsIntegration)
+    assert bot.application is app_mock
+
+    # Обработчики: 4 команды, сообщения, колбэки — плюс обработчик ошибок
+    assert app_mock.handler_count == 6
+    app_mock.add_error_handler.assert_called_once()
+
+
+async def test_start_command(bot):
+    """Тест команды /start."""
+    update = _make_update()
+    context = Mock()
+
+    await bot.start_command(update, context)
+
+    bot.memory_manager.add_system_message.assert_called_once()
+    update.message.reply_text.assert_awaited_once()
+
+
+async def test_help_command(bot):
+    """Тест команды /help."""
+    update = _make_update()
+    context = Mock()
+
+    await bot.help_command(update, context)
+
+    update.message.reply_text.assert_awaited_once()
+
+
+async def test_reset_command(bot):
+    """Тест команды /reset."""
+    update = _make_update()
+    context = Mock()
+    bot.memory_analytics.process_conversation_history = Mock(return_value=5)
+
+    await bot.reset_command(update, context)
+
+    bot.memory_analytics.process_conversation_history.assert_called_once_with(
+        user_id="123",
+        process_all=True
+    )
+    bot.memory_manager.clear_memory.assert_called_once_with("123")
+    update.message.reply_text.assert_awaited_once()
+
+
+async def test_mode_command(bot):
+    """Тест команды /mode."""
+    update = _make_update()
+    context = Mock()
+
+    await bot.mode_command(update, context)
+
+    update.message.reply_text.assert_awaited_once()
+    args, kwargs = update.message.reply_text.call_args
+    # Клавиатура кешируется в __init__ и переиспользуется как есть
+    assert kwargs["reply_markup"] is bot._mode_markup
+
+
+async def test_handle_callback_mistral(bot):
+    """Тест обработки колбэка для выбора режима Mistral API."""
+    query = AsyncMock()
+    query.data = "mode_mistral"
+    query.from_user = SimpleNamespace(id=123)
+    update = SimpleNamespace(callback_query=query)
+
+    await bot.handle_callback(update, Mock())
+
+    query.answer.assert_awaited_once()
+    query.edit_message_text.assert_awaited_once_with("Режим работы изменен на Mistral API")
+    assert not bot.use_langchain_router
+
+
+async def test_handle_callback_langchain(bot):
+    """Тест обработки колбэка для выбора режима LangChain Router."""
+    query = AsyncMock()
+    query.data = "mode_langchain"
+    query.from_user = SimpleNamespace(id=123)
+    update = SimpleNamespace(callback_query=query)
+
+    bot.use_langchain_router = False
+
+    await bot.handle_callback(update, Mock())
+
+    query.answer.assert_awaited_once()
+    query.edit_message_text.assert_awaited_once_with("Режим работы изменен на LangChain Router")
+    assert bot.use_langchain_router
+
+
+@pytest.fixture
+def message_env(bot):
+    """Самая тяжелая связка в файле — обновление с текстом, контекст
+    с асинхронным ботом и заглушки генерации/прогресса. Вынесена в
+    фикстуру, чтобы новые тесты handle_message не повторяли сборку."""
+    context = Mock()
+    context.bot = AsyncMock()
+    bot.process_with_mistral_api = AsyncMock(return_value="Test response")
+    # Фоновое обновление прогресса в тестах не нужно
+    bot.update_progress_message = AsyncMock()
+    return SimpleNamespace(
+        update=_make_update(text="Test message"),
+        context=context
+    )
+
+
+async def test_handle_message_mistral_mode(bot, message_env):
+    """Тест обработки сообщения в режиме Mistral API."""
+    update, context = message_env.update, message_env.context
+
+    bot.use_langchain_router = False
+
+    await bot.handle_message(update, context)
+
+    bot.memory_manager.add_user_message.assert_called_once_with("123", "Test message")
+    context.bot.send_chat_action.assert_awaited_once()
+    bot.process_with_mistral_api.assert_awaited_once_with("123", "Test message")
+    bot.memory_manager.add_ai_message.assert_called_once()
+    context.bot.edit_message_text.assert_awaited_once()
+    assert context.bot.edit_message_text.call_args.kwargs["text"] == "Test response"
+    bot.data_collector.record_interaction.assert_called_once()
@@ -2,17 +2,9 @@
 Тесты для модуля интеграции тестирования агентов с памятью диалогов.
 """
 
-import os
-import sys
 import unittest
 from unittest.mock import Mock, patch, call
 
-# Добавляем корневую директорию проекта в путь для импорта
-current_dir = os.path.dirname(os.path.abspath(__file__))
-project_root = os.path.dirname(os.path.dirname(current_dir))
-if project_root not in sys.path:
-    sys.path.append(project_root)
-
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
 
 from multi_agent_system.agent_developer.testing_memory_integration import TestingMemoryIntegration, create_auto_improvement_cycle